@@ -7,10 +7,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+import html
+import numpy as np
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
-from sheets_helper import GoogleHelper
+from sheets_helper import SheetReadError, get_google_helper, show_read_error
 from config_helper import ConfigHelper
 from environment_helper import get_environment_helper
 
@@ -36,10 +37,32 @@ debug_mode = env_helper.is_debug_mode()
 def init_config():
     return ConfigHelper()
 
-# Initialize Google helper
-@st.cache_resource
-def init_helper():
-    return GoogleHelper(GOOGLE_CREDENTIALS_FILE)
+# Convert sheet column dtypes once here instead of on every aggregation
+def convert_dtypes(df, numeric_columns=(), date_columns=(), day_columns=(), category_columns=()):
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    for col in date_columns:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    # Day-only columns are floored here so bucketing by day needs no per-rerun conversion
+    for col in day_columns:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.floor('D')
+    # Low-cardinality text columns are grouped and compared on every rerun
+    for col in category_columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+# Load sheet records (cached so widget reruns don't refetch from Google Sheets)
+@st.cache_data(ttl=300, max_entries=8, show_spinner=False)
+def load_records(spreadsheet_id, sheets):
+    # All ranges are fetched in one batch request
+    # A failed read raises instead of returning empty frames, so it is never cached
+    frames = get_google_helper(GOOGLE_CREDENTIALS_FILE).get_records_batch(
+        spreadsheet_id, [range_name for range_name, _ in sheets], raise_errors=True)
+    return [convert_dtypes(df, **dtypes) for df, (_, dtypes) in zip(frames, sheets)]
 
 # Initialize configuration
 config = init_config()
@@ -73,17 +96,56 @@ Silakan gunakan menu di sidebar untuk navigasi.
 INBOUND_RANGE = config.get_sheet_range("inbound")
 OUTBOUND_RANGE = config.get_sheet_range("outbound")
 
-# Get global column names that are used in multiple functions
-quantity_col = config.get_column_name("inbound", 5)  # "Quantity" column for inbound data
+# Resolve column names used across the dashboard once per run
+class InboundCols:
+    TIMESTAMP = config.get_column_name("inbound", 0)       # "Timestamp"
+    ANIMAL_TYPE = config.get_column_name("inbound", 2)     # "Tipe Hewan"
+    SUPPLIER = config.get_column_name("inbound", 3)        # "Supplier"
+    VARIANT = config.get_column_name("inbound", 4)         # "Varian"
+    QUANTITY = config.get_column_name("inbound", 5)        # "Quantity"
+    DELIVERY_DATE = config.get_column_name("inbound", 10)  # "Tanggal Pengiriman"
+
+class OutboundCols:
+    ANIMAL_TYPE = config.get_column_name("outbound", 1)    # "Tipe Hewan"
+    QUANTITY = config.get_column_name("outbound", 3)       # "Quantity"
+
+# Daily charts cover H-4 through H+2, as days and as dd/mm axis labels
+TARGET_DAYS = pd.to_datetime(list(config.get_hari_options("inbound").values())).to_numpy()
+TARGET_DATES = tuple(f"{day:%d/%m}" for day in pd.DatetimeIndex(TARGET_DAYS))
 
 st.header("Dashboard Manajemen Qurban")
 
-# Initialize helper
-helper = init_helper()
+# Manual refresh to bypass the cached sheet data
+if st.sidebar.button("🔄 Refresh Data"):
+    load_records.clear()
 
 # Load data
-inbound_df = helper.get_records(SPREADSHEET_ID, INBOUND_RANGE)
-outbound_df = helper.get_records(SPREADSHEET_ID, OUTBOUND_RANGE)
+try:
+    inbound_df, outbound_df = load_records(SPREADSHEET_ID, (
+        (INBOUND_RANGE, dict(
+            numeric_columns=(InboundCols.QUANTITY,),
+            date_columns=(InboundCols.TIMESTAMP,),
+            day_columns=(InboundCols.DELIVERY_DATE,),
+            category_columns=(InboundCols.ANIMAL_TYPE, InboundCols.SUPPLIER, InboundCols.VARIANT)
+        )),
+        (OUTBOUND_RANGE, dict(
+            numeric_columns=(OutboundCols.QUANTITY,),
+            category_columns=(OutboundCols.ANIMAL_TYPE,)
+        ))
+    ))
+except SheetReadError as e:
+    # Shown here rather than inside load_records, so a cache hit never replays it
+    show_read_error(e)
+    st.stop()
+
+# Outbound totals per animal type, shared by the stock summary and order data
+OUT_BY_ANIMAL = {}
+if not outbound_df.empty:
+    try:
+        OUT_BY_ANIMAL = outbound_df.groupby(OutboundCols.ANIMAL_TYPE, observed=True)[OutboundCols.QUANTITY].sum().to_dict()
+    except (KeyError, AttributeError) as e:
+        if debug_mode:
+            st.error(f"Error processing outbound data: {e}")
 
 # Get column names from config
 inbound_columns = config.get_sheet_columns("inbound")
@@ -92,119 +154,139 @@ outbound_columns = config.get_sheet_columns("outbound")
 # Create navigation tabs
 tab1, tab2 = st.tabs(["📊 Ringkasan Stok", "📦 Status Pesanan"])
 
-def create_daily_progress_table(inbound_df, supplier_filter=None, animal_filter=None, status_filter=None):
-    """Create daily progress table showing delivery quantities by date - text format"""
-    if inbound_df.empty:
-        return None
+@st.cache_data(show_spinner=False)
+def get_daily_totals(df, date_col, timestamp_col, quantity_col):
+    """Sum quantities per day, using the delivery date when available and the timestamp otherwise"""
+    if df.empty or not quantity_col or quantity_col not in df.columns:
+        return pd.Series(dtype=float)
     
-    try:
-        # Get proper column names from config
-        supplier_col = config.get_column_name("inbound", 3)      # "Supplier"
-        animal_type_col = config.get_column_name("inbound", 2)   # "Tipe Hewan"
-        variant_col = config.get_column_name("inbound", 4)       # "Varian"
-        quantity_col = config.get_column_name("inbound", 5)      # "Quantity"
-        date_col = config.get_column_name("inbound", 10)         # "Tanggal Pengiriman"
-        timestamp_col = config.get_column_name("inbound", 0)     # "Timestamp"
-        
-        # Check if required columns exist
-        if not quantity_col or quantity_col not in inbound_df.columns:
-            return None
-        
-        # Create copy for filtering
-        filtered_df = inbound_df.copy()
-        
-        # Apply filters
-        if supplier_filter and supplier_filter != "Semua" and supplier_col and supplier_col in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df[supplier_col] == supplier_filter]
-        
-        if animal_filter and animal_filter != "Semua" and animal_type_col and animal_type_col in filtered_df.columns:
-            # Handle both general animal (like "Domba/Kambing") and specific variant filtering
-            if animal_filter in ["Domba/Kambing", "Sapi"]:
-                # General animal filter
-                filtered_df = filtered_df[filtered_df[animal_type_col] == animal_filter]
-            else:
-                # Specific variant filter - use variant column if available
-                if variant_col and variant_col in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df[variant_col] == animal_filter]
-        
-        if filtered_df.empty:
-            return None
-        
-        # Use delivery date if available, otherwise use timestamp
-        date_column_to_use = date_col if date_col and date_col in filtered_df.columns and not filtered_df[date_col].isna().all() else timestamp_col
-        
-        if not date_column_to_use or date_column_to_use not in filtered_df.columns:
-            return None
-            
-        # Convert to datetime and extract date part
-        filtered_df['date'] = pd.to_datetime(filtered_df[date_column_to_use], errors='coerce').dt.date
-        
-        # Remove rows with invalid dates
-        filtered_df = filtered_df.dropna(subset=['date'])
-        
-        if filtered_df.empty:
-            return None
-        
-        # Convert quantity to numeric before summing
-        filtered_df[quantity_col] = pd.to_numeric(filtered_df[quantity_col], errors='coerce').fillna(0)
-        
-        # Group by date and sum quantities
-        daily_totals = filtered_df.groupby('date')[quantity_col].sum().reset_index()
-        daily_totals = daily_totals.sort_values('date')
-        
-        if daily_totals.empty:
-            return None
-        
-        # Convert to text format instead of dataframe table
-        if len(daily_totals) <= 10:  # Show all if 10 or fewer dates
-            for _, row in daily_totals.iterrows():
-                date_str = row['date'].strftime('%d/%m') if hasattr(row['date'], 'strftime') else str(row['date'])
-                st.markdown(f"**{date_str}** | {int(row[quantity_col])} ekor", unsafe_allow_html=True)
-        else:
-            # Show recent dates
-            recent_dates = daily_totals.tail(10)  # Show last 10 dates
-            for _, row in recent_dates.iterrows():
-                date_str = row['date'].strftime('%d/%m') if hasattr(row['date'], 'strftime') else str(row['date'])
-                st.markdown(f"**{date_str}** | {int(row[quantity_col])} ekor", unsafe_allow_html=True)
-        
-        return True  # Indicate successful rendering
-        
-    except Exception as e:
-        if debug_mode:
-            st.error(f"Error in daily progress: {str(e)}")
-        return None
+    # Use delivery date if available, otherwise use timestamp
+    # Blank delivery dates are NaT after load_records, so an all-blank column falls back too
+    date_column_to_use = date_col if date_col and date_col in df.columns and df[date_col].notna().any() else timestamp_col
+    
+    if not date_column_to_use or date_column_to_use not in df.columns:
+        return pd.Series(dtype=float)
+    
+    # Dates are already parsed by load_records, so day resolution also normalizes timestamps
+    days = df[date_column_to_use].to_numpy().astype('datetime64[D]')
+    quantities = df[quantity_col].to_numpy()
+    
+    # Rows with invalid dates are dropped, the rest summed per run of equal days once sorted
+    valid = ~np.isnat(days)
+    if not valid.any():
+        return pd.Series(dtype=float)
+    order = np.argsort(days[valid], kind='stable')
+    days = days[valid][order]
+    quantities = quantities[valid][order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1))
+    return pd.Series(np.add.reduceat(quantities, starts), index=pd.DatetimeIndex(days[starts]))
+
+def quantities_on_dates(daily_totals, target_days):
+    """Gather daily totals for each target day, 0 for days without arrivals"""
+    if daily_totals.empty:
+        return [0] * len(target_days)
+    
+    # daily_totals is sorted by date, so one searchsorted finds every target day
+    dates_arr = daily_totals.index.to_numpy()
+    qty_arr = daily_totals.to_numpy()
+    idx = np.searchsorted(dates_arr, target_days).clip(max=len(dates_arr) - 1)
+    return np.where(dates_arr[idx] == target_days, qty_arr[idx], 0).astype(int).tolist()
 
-def process_order_data(inbound_df, outbound_df, selected_animal=None):
-    """Process inbound data to create order summaries with expected quantities and outbound data"""
+def target_day_totals(df, date_col, timestamp_col, quantity_col, target_days):
+    """Sum quantities into one bucket per target day in a single pass over the raw arrays"""
+    # Use delivery date if available, otherwise use timestamp
+    # Blank delivery dates are NaT after load_records, so an all-blank column falls back too
+    date_column_to_use = date_col if date_col and date_col in df.columns and df[date_col].notna().any() else timestamp_col
+    
+    targets = np.asarray(target_days, dtype='datetime64[D]')
+    if df.empty or not date_column_to_use or date_column_to_use not in df.columns:
+        return [0] * len(targets)
+    
+    days = df[date_column_to_use].to_numpy().astype('datetime64[D]')
+    idx = np.searchsorted(targets, days).clip(max=len(targets) - 1)
+    # NaT never equals a target day, so invalid dates drop out here
+    in_target = targets[idx] == days
+    totals = np.bincount(idx[in_target], weights=df[quantity_col].to_numpy()[in_target], minlength=len(targets))
+    return totals.astype(int).tolist()
+
+@st.cache_data(show_spinner=False)
+def daily_progress_figure(dates, quantities, title):
+    """Build the daily bar chart once per distinct set of bars"""
+    # Plotly is heavy to import, so only pay for it once a chart is actually drawn
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Bar(x=list(dates), y=list(quantities)))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Tanggal',
+        yaxis_title='Jumlah (ekor)',
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        showlegend=False
+    )
+    return fig
+
+# Status filter options and their completion bins in order_data['status_bin']
+STATUS_BINS = {
+    '🟢 100%': 2,
+    '🟡 50-99%': 1,
+    '🔴 0-49%': 0
+}
+
+@st.cache_resource(show_spinner=False)
+def orders_lookup_df():
+    """Flatten configured orders into one row per (animal_type, category, supplier)"""
+    rows = []
+    for animal_key, orders in config.get_animal_orders().items():
+        animal_type = 'Domba/Kambing' if animal_key == 'Domba' else 'Sapi'
+        seen_categories = set()
+        for order in orders:
+            # Repeated categories resolve to their first entry, like the config lookup
+            if order['category'] in seen_categories:
+                continue
+            seen_categories.add(order['category'])
+            for vendor, qty in order.get('vendors', {}).items():
+                rows.append((animal_type, order['category'], vendor, qty))
+    
+    return pd.DataFrame(rows, columns=['animal_type', 'category', 'supplier', 'ordered_quantity'])
+
+@st.cache_resource(show_spinner=False)
+def configured_orders_df():
+    """Flatten every configured vendor order with a positive quantity into one row"""
+    rows = []
+    for animal_key in ['Domba', 'Sapi']:
+        animal_type = 'Domba/Kambing' if animal_key == 'Domba' else 'Sapi'
+        for order in config.get_animal_orders().get(animal_key, []):
+            for vendor, qty in order.get('vendors', {}).items():
+                if vendor and qty > 0:  # Skip empty vendors
+                    rows.append((vendor, animal_type, order['category'], qty))
+    
+    return pd.DataFrame(rows, columns=['supplier', 'animal_type', 'variant', 'ordered_quantity'])
+
+@st.cache_data(show_spinner=False)
+def process_order_data(inbound_df, outbound_totals):
+    """Process inbound data to create order summaries with expected quantities and outbound totals for all animal types"""
     if inbound_df.empty:
         inbound_processed = pd.DataFrame()
     else:
-        # Get column names
-        animal_type_col = config.get_column_name("inbound", 2)  # "Tipe Hewan"
-        supplier_col = config.get_column_name("inbound", 3)     # "Supplier"
-        variant_col = config.get_column_name("inbound", 4)      # "Varian"
-        quantity_col = config.get_column_name("inbound", 5)     # "Quantity"
-        date_col = config.get_column_name("inbound", 10)        # "Tanggal Pengiriman"
-        timestamp_col = config.get_column_name("inbound", 0)    # "Timestamp"
+        # Column names resolved once at load
+        animal_type_col = InboundCols.ANIMAL_TYPE
+        supplier_col = InboundCols.SUPPLIER
+        variant_col = InboundCols.VARIANT
+        quantity_col = InboundCols.QUANTITY
+        date_col = InboundCols.DELIVERY_DATE
+        timestamp_col = InboundCols.TIMESTAMP
         
         if not all([animal_type_col, supplier_col, variant_col, quantity_col]):
             inbound_processed = pd.DataFrame()
         else:
             try:
-                # Clean and prepare data
-                df_clean = inbound_df.copy()
-                df_clean[quantity_col] = pd.to_numeric(df_clean[quantity_col], errors='coerce').fillna(0)
-                
-                # Filter by selected animal if specified
-                if selected_animal and selected_animal != "Semua":
-                    df_clean = df_clean[df_clean[animal_type_col] == selected_animal]
-
                 # Group by supplier, animal type, and variant to create delivery summaries
-                delivery_summary = df_clean.groupby([
+                delivery_summary = inbound_df.groupby([
                     supplier_col, 
                     animal_type_col, 
                     variant_col
-                ]).agg({
+                ], observed=True).agg({
                     quantity_col: 'sum',
                     timestamp_col: 'count'  # Count deliveries
                 }).reset_index()
@@ -221,136 +303,226 @@ def process_order_data(inbound_df, outbound_df, selected_animal=None):
                     st.error(f"Error processing inbound data: {e}")
                 inbound_processed = pd.DataFrame()
     
-    # Process outbound data for "Keluar" metric
-    outbound_totals = {}
-    if not outbound_df.empty:
-        try:
-            animal_type_col_out = config.get_column_name("outbound", 1)  # "Tipe Hewan"
-            quantity_col_out = config.get_column_name("outbound", 3)     # "Quantity"
-            
-            if animal_type_col_out and quantity_col_out:
-                df_out_clean = outbound_df.copy()
-                df_out_clean[quantity_col_out] = pd.to_numeric(df_out_clean[quantity_col_out], errors='coerce').fillna(0)
-                
-                # Filter by selected animal if specified
-                if selected_animal and selected_animal != "Semua":
-                    df_out_clean = df_out_clean[df_out_clean[animal_type_col_out] == selected_animal]
-                
-                # Group by animal type for outbound totals
-                outbound_summary = df_out_clean.groupby(animal_type_col_out)[quantity_col_out].sum()
-                outbound_totals = outbound_summary.to_dict()
-                
-        except (KeyError, AttributeError) as e:
-            if debug_mode:
-                st.error(f"Error processing outbound data: {e}")
+    order_columns = [
+        'supplier', 'animal_type', 'variant', 'ordered_quantity', 'total_delivered',
+        'total_outbound', 'remaining_quantity', 'delivery_count', 'completion_rate'
+    ]
     
     # Add order data from config and outbound data
-    order_data = []
+    delivered_data = pd.DataFrame(columns=order_columns)
     if not inbound_processed.empty:
-        for _, row in inbound_processed.iterrows():
-            ordered_qty = config.get_order_data_for_supplier_and_category(
-                row['animal_type'], 
-                row['supplier'], 
-                row['variant']
-            )
-            
-            # Get outbound quantity for this animal type
-            outbound_qty = outbound_totals.get(row['animal_type'], 0)
-            
-            order_data.append({
-                'supplier': row['supplier'],
-                'animal_type': row['animal_type'],
-                'variant': row['variant'],
-                'ordered_quantity': ordered_qty,
-                'total_delivered': row['total_delivered'],
-                'total_outbound': outbound_qty,
-                'remaining_quantity': max(0, ordered_qty - row['total_delivered']),
-                'delivery_count': row['delivery_count'],
-                'completion_rate': (row['total_delivered'] / ordered_qty * 100) if ordered_qty > 0 else 0
-            })
+        # Resolve each delivered variant to its order category once per unique variant
+        variants = inbound_processed[['animal_type', 'variant']].drop_duplicates()
+        variants['category'] = [
+            config.get_order_category(animal_type, variant)
+            for animal_type, variant in variants.itertuples(index=False, name=None)
+        ]
+        
+        merged = inbound_processed.merge(variants, on=['animal_type', 'variant'], how='left')
+        merged = merged.merge(orders_lookup_df(), on=['animal_type', 'category', 'supplier'], how='left')
+        merged['ordered_quantity'] = merged['ordered_quantity'].fillna(0)
+        
+        # Outbound quantity for each row's animal type
+        merged['total_outbound'] = merged['animal_type'].map(outbound_totals).fillna(0)
+        merged['remaining_quantity'] = (merged['ordered_quantity'] - merged['total_delivered']).clip(lower=0)
+        merged['completion_rate'] = np.where(
+            merged['ordered_quantity'] > 0,
+            merged['total_delivered'] / merged['ordered_quantity'] * 100,
+            0
+        )
+        delivered_data = merged[order_columns]
     
     # Also add orders that haven't had any deliveries yet
-    all_orders = config.get_animal_orders()
-    existing_combinations = set((row['supplier'], row['animal_type'], row['variant']) 
-                              for row in order_data)
+    order_keys = ['supplier', 'animal_type', 'variant']
+    delivered_keys = delivered_data[order_keys].drop_duplicates().astype(object)
+    undelivered_data = configured_orders_df().merge(delivered_keys, on=order_keys, how='left', indicator=True)
+    undelivered_data = undelivered_data[undelivered_data['_merge'] == 'left_only'].drop(columns='_merge')
     
-    for animal_key in ['Domba', 'Sapi']:
-        animal_type = 'Domba/Kambing' if animal_key == 'Domba' else 'Sapi'
-        
-        # Skip if we're filtering for a specific animal and this doesn't match
-        if selected_animal and selected_animal != "Semua" and animal_type != selected_animal:
-            continue
+    # Get outbound quantity for each order's animal type
+    undelivered_data['total_delivered'] = 0
+    undelivered_data['total_outbound'] = undelivered_data['animal_type'].map(outbound_totals).fillna(0)
+    undelivered_data['remaining_quantity'] = undelivered_data['ordered_quantity']
+    undelivered_data['delivery_count'] = 0
+    undelivered_data['completion_rate'] = 0
+    undelivered_data = undelivered_data[order_columns]
+    frames = [df for df in (delivered_data, undelivered_data) if not df.empty]
+    order_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=order_columns)
+    
+    # Title-cased names for the cards, formatted once for every order
+    order_data['supplier_display'] = order_data['supplier'].str.title()
+    order_data['variant_display'] = order_data['variant'].str.title()
+    
+    # Completion status bin for the status filter, see STATUS_BINS
+    completion = order_data['completion_rate'].to_numpy(dtype=float)
+    order_data['status_bin'] = np.select([completion >= 100, completion >= 50], [2, 1], default=0).astype(np.int8)
+    
+    # Compact dtypes for the filter compares and card totals
+    order_data = order_data.astype({
+        'supplier': 'category',
+        'animal_type': 'category',
+        'variant': 'category',
+        'ordered_quantity': np.int32,
+        'delivery_count': np.int32,
+        'total_delivered': np.float32,
+        'total_outbound': np.float32,
+        'remaining_quantity': np.float32
+    })
+    return order_data
+
+# Sum quantities for every animal type in a single groupby
+def totals_by_animal(df, sheet_type):
+    if df.empty:
+        return {}
+        
+    # Get column names from config
+    if sheet_type == "inbound":
+        animal_type_col = InboundCols.ANIMAL_TYPE
+        quantity_col = InboundCols.QUANTITY
+    else:  # outbound
+        animal_type_col = OutboundCols.ANIMAL_TYPE
+        quantity_col = OutboundCols.QUANTITY
+    
+    if not animal_type_col or not quantity_col:
+        return {}
         
-        for order in all_orders.get(animal_key, []):
-            category = order['category']
-            vendors = order.get('vendors', {})
-            
-            for vendor, qty in vendors.items():
-                if vendor and qty > 0:  # Skip empty vendors
-                    # Check if this combination already exists in delivered data
-                    combo = (vendor, animal_type, category)
-                    if combo not in existing_combinations:
-                        # Get outbound quantity for this animal type
-                        outbound_qty = outbound_totals.get(animal_type, 0)
-                        
-                        order_data.append({
-                            'supplier': vendor,
-                            'animal_type': animal_type,
-                            'variant': category,
-                            'ordered_quantity': qty,
-                            'total_delivered': 0,
-                            'total_outbound': outbound_qty,
-                            'remaining_quantity': qty,
-                            'delivery_count': 0,
-                            'completion_rate': 0
-                        })
+    # Quantity is already numeric from load_records
+    try:
+        return df.groupby(animal_type_col, observed=True)[quantity_col].sum().to_dict()
+    except (KeyError, AttributeError):
+        return {}
+
+# Progress color bands: below 25%, 25-50%, 50-75% and 75%+ (0% is always red)
+PROGRESS_THRESHOLDS = np.array([25, 50, 75])
+PROGRESS_COLORS = (
+    "#fd7e14",  # Orange for low progress
+    "#ffc107",  # Yellow for medium-low
+    "#20c997",  # Teal for medium-high
+    "#198754"   # Green for high progress
+)
+
+def get_progress_color(completion_rate):
+    """Get progress bar color for a completion rate"""
+    if completion_rate == 0:
+        return "#dc3545"  # Red for 0%
+    return PROGRESS_COLORS[np.searchsorted(PROGRESS_THRESHOLDS, completion_rate, side='right')]
+
+def get_status_color(delivered, ordered):
+    """Get color based on delivery completion rate"""
+    if ordered == 0:
+        return "⚫"  # No order data
     
-    return pd.DataFrame(order_data)
+    completion_rate = delivered / ordered
+    if completion_rate >= 1.0:
+        return "🟢"  # Complete (100%+)
+    elif completion_rate >= 0.8:
+        return "🟡"  # Near complete (80%+)
+    elif completion_rate >= 0.5:
+        return "🟠"  # Partial (50%+)
+    elif completion_rate > 0:
+        return "🔴"  # Started but low
+    else:
+        return "⚪"  # Not started
 
-with tab1:
-    # Original dashboard content
-    # Process data for goats and cows separately
-    def process_animal_data(df, animal_type, sheet_type):
-        if df.empty:
-            return 0
-            
-        # Get column names from config
-        if sheet_type == "inbound":
-            animal_type_col = config.get_column_name("inbound", 2)  # "Tipe Hewan"
-            quantity_col = config.get_column_name("inbound", 5)     # "Quantity"
-        else:  # outbound
-            animal_type_col = config.get_column_name("outbound", 1)  # "Tipe Hewan"  
-            quantity_col = config.get_column_name("outbound", 3)     # "Quantity"
+# order_data columns in render_order_card_html argument order
+ORDER_CARD_COLUMNS = [
+    'supplier_display', 'animal_type', 'variant_display', 'ordered_quantity', 'total_delivered',
+    'total_outbound', 'remaining_quantity', 'delivery_count', 'completion_rate'
+]
+
+def render_order_card_html(supplier, animal_type, variant, ordered_qty, delivered_qty, outbound_qty, remaining_qty, delivery_count, completion_rate):
+    """Build the HTML for one order card so a whole grid of cards can be emitted at once"""
+    
+    status_icon = get_status_color(delivered_qty, ordered_qty)
+    
+    # Determine progress color (green-based with red for 0%)
+    progress_color = get_progress_color(completion_rate)
+    
+    # The whole card is one HTML block instead of one element per row
+    progress_pct = min(100.0, max(0.0, completion_rate))
+    metrics_html = "".join(
+        f"<div style='flex: 1;'><div style='font-size: 14px; opacity: 0.7;'>{label}</div>"
+        f"<div style='font-size: 2rem;'>{int(value)}</div></div>"
+        for label, value in (("Dipesan", ordered_qty), ("Diterima", delivered_qty), ("Sisa", remaining_qty))
+    )
+    return (
+        f"<div><h5>{status_icon} {html.escape(str(supplier))} | {html.escape(str(variant))}</h5>"
+        f"<div style='background: rgba(151, 166, 195, 0.25); border-radius: 4px; height: 8px;'>"
+        f"<div style='width: {progress_pct:.1f}%; background: {progress_color}; border-radius: 4px; height: 8px;'></div></div>"
+        f"<div style='text-align: center; margin-top: 6px;'><h2 style='margin: 0; color: {progress_color};'>{completion_rate:.1f}% selesai</h2></div>"
+        f"<div style='display: flex; gap: 1rem;'>{metrics_html}</div>"
+        f"<hr></div>"
+    )
+
+def render_card_grid(cards_html):
+    """Emit order cards as a single two-column grid"""
+    st.markdown(
+        f"<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;'>{''.join(cards_html)}</div>",
+        unsafe_allow_html=True
+    )
+
+def render_order_cards(order_rows):
+    """Render the order card grid for a frame of order_data rows"""
+    render_card_grid([
+        render_order_card_html(*row)
+        for row in order_rows[ORDER_CARD_COLUMNS].itertuples(index=False, name=None)
+    ])
+
+def render_vendor_summary_card(vendor_totals):
+    """Render vendor summary card from the vendor's pre-aggregated totals row"""
+    
+    # Totals for this vendor, aggregated once for all vendors
+    total_ordered = vendor_totals.total_ordered
+    total_delivered = vendor_totals.total_delivered
+    total_remaining = vendor_totals.total_remaining
+    completion_rate = vendor_totals.completion_rate
+    
+    # Determine status
+    status_icon = get_status_color(total_delivered, total_ordered)
+    
+    # Determine progress color (green-based with red for 0%)
+    progress_color = get_progress_color(completion_rate)
+    
+    # Name is already title-cased in process_order_data
+    formatted_supplier = vendor_totals.supplier_display
+    
+    with st.container():
+        # Header - supplier only, title case, no caps
+        st.markdown(f"#### {status_icon} {formatted_supplier}")
         
-        if not animal_type_col or not quantity_col:
-            return 0
-            
-        # Filter by animal type
-        try:
-            animal_df = df[df[animal_type_col] == animal_type]
-            if animal_df.empty:
-                return 0
-            
-            return pd.to_numeric(animal_df[quantity_col], errors='coerce').fillna(0).sum()
-        except (KeyError, AttributeError):
-            return 0
+        # Progress bar with bigger percentage and green-based coloring
+        progress_value = min(1.0, max(0.0, completion_rate / 100))
+        st.progress(progress_value)
+        st.markdown(f"<div style='text-align: center; margin-top: -10px;'><h2 style='margin: 0; color: {progress_color};'>{completion_rate:.1f}% selesai</h2></div>", unsafe_allow_html=True)
+        
+        # Metrics using st.metric for better visualization
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Dipesan", f"{int(total_ordered)} ekor")
+        
+        with col2:
+            st.metric("Diterima", f"{int(total_delivered)} ekor")
+        
+        with col3:
+            st.metric("Sisa", f"{int(total_remaining)} ekor")
+        
+        st.markdown("---")
 
+def render_stock_summary_tab(inbound_df, outbound_df):
+    """Render stock totals, overall progress and the daily progress chart"""
     # Calculate totals
     if not inbound_df.empty or not outbound_df.empty:
-        # Debug: Show what animal types we have in the data
-        if not inbound_df.empty:
-            animal_col = config.get_column_name("inbound", 2)
-            if animal_col and animal_col in inbound_df.columns:
-                unique_animals = inbound_df[animal_col].unique()
-        
         st.subheader("Ringkasan Stok")
         
+        inbound_totals = totals_by_animal(inbound_df, "inbound")
+        outbound_totals = OUT_BY_ANIMAL
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("##### Domba/Kambing")
-            goats_in = process_animal_data(inbound_df, "Domba/Kambing", "inbound")
-            goats_out = process_animal_data(outbound_df, "Domba/Kambing", "outbound")
+            goats_in = inbound_totals.get("Domba/Kambing", 0)
+            goats_out = outbound_totals.get("Domba/Kambing", 0)
             goats_stock = goats_in - goats_out
             
             st.metric("Total Masuk", f"{int(goats_in)} ekor")
@@ -359,8 +531,8 @@ with tab1:
             
         with col2:
             st.markdown("##### Sapi")
-            cows_in = process_animal_data(inbound_df, "Sapi", "inbound")
-            cows_out = process_animal_data(outbound_df, "Sapi", "outbound")
+            cows_in = inbound_totals.get("Sapi", 0)
+            cows_out = outbound_totals.get("Sapi", 0)
             cows_stock = cows_in - cows_out
             
             st.metric("Total Masuk", f"{int(cows_in)} ekor")
@@ -372,7 +544,7 @@ with tab1:
         st.markdown("##### Progress Keseluruhan")
         
         # Calculate overall progress from order data
-        order_data_for_progress = process_order_data(inbound_df, outbound_df)
+        order_data_for_progress = process_order_data(inbound_df, OUT_BY_ANIMAL)
         if not order_data_for_progress.empty:
             total_ordered_all = order_data_for_progress['ordered_quantity'].sum()
             total_delivered_all = order_data_for_progress['total_delivered'].sum()
@@ -402,59 +574,24 @@ with tab1:
         st.markdown("#### 📈 Progress Harian")
         
         # Get daily progress data
-        daily_progress_data = {}
-        try:
-            if not inbound_df.empty:
-                quantity_col = config.get_column_name("inbound", 5)      # "Quantity"
-                date_col = config.get_column_name("inbound", 10)         # "Tanggal Pengiriman"
-                timestamp_col = config.get_column_name("inbound", 0)     # "Timestamp"
+        quantities = [0] * len(TARGET_DAYS)
+        if not inbound_df.empty:
+            quantity_col = InboundCols.QUANTITY
+            date_col = InboundCols.DELIVERY_DATE
+            timestamp_col = InboundCols.TIMESTAMP
                 
-                if quantity_col and quantity_col in inbound_df.columns:
-                    filtered_df = inbound_df.copy()
-                    date_column_to_use = date_col if date_col and date_col in filtered_df.columns and not filtered_df[date_col].isna().all() else timestamp_col
-                    
-                    if date_column_to_use and date_column_to_use in filtered_df.columns:
-                        filtered_df['date'] = pd.to_datetime(filtered_df[date_column_to_use], errors='coerce').dt.date
-                        filtered_df = filtered_df.dropna(subset=['date'])
-                        
-                        if not filtered_df.empty:
-                            filtered_df[quantity_col] = pd.to_numeric(filtered_df[quantity_col], errors='coerce').fillna(0)
-                            daily_totals = filtered_df.groupby('date')[quantity_col].sum().reset_index()
-                            daily_totals = daily_totals.sort_values('date')
-                            
-                            for _, row in daily_totals.iterrows():
-                                date_str = row['date'].strftime('%d/%m') if hasattr(row['date'], 'strftime') else str(row['date'])
-                                daily_progress_data[date_str] = int(row[quantity_col])
-        except:
-            pass
-        
-        # Create horizontal bar chart
-        target_dates = ["02/06", "03/06", "04/06", "05/06", "06/06", "07/06", "08/06"]
-        quantities = [daily_progress_data.get(date, 0) for date in target_dates]
-        
-        # Create horizontal bar chart using plotly with reversed axes
-        fig = px.bar(
-            y=quantities,
-            x=target_dates,
-            orientation='v',
-            labels={'y': 'Jumlah (ekor)', 'x': 'Tanggal'},
-            title='Progress Harian Pengiriman'
-        )
-        
-        # Update layout for better visualization
-        fig.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=40, b=20),
-            showlegend=False
-        )
+            daily_totals = get_daily_totals(inbound_df, date_col, timestamp_col, quantity_col)
+            quantities = quantities_on_dates(daily_totals, TARGET_DAYS)
         
-        # Display the chart
+        # Display the chart, rebuilt only when the bars change
+        fig = daily_progress_figure(TARGET_DATES, tuple(quantities), 'Progress Harian Pengiriman')
         st.plotly_chart(fig, use_container_width=True)
 
     else:
         st.info("Belum ada data yang tercatat. Silakan mulai dengan mencatat hewan masuk.")
 
-with tab2:
+def render_order_status_tab(inbound_df, outbound_df):
+    """Render order status filters, summary and order cards for the selected animal"""
     # New Order Tracking View with general animal selector
     st.subheader("📦 Status Pesanan dan Pengiriman")
     
@@ -467,246 +604,66 @@ with tab2:
     
     st.markdown("---")
     
-    def get_status_color(delivered, ordered):
-        """Get color based on delivery completion rate"""
-        if ordered == 0:
-            return "⚫"  # No order data
-        
-        completion_rate = delivered / ordered
-        if completion_rate >= 1.0:
-            return "🟢"  # Complete (100%+)
-        elif completion_rate >= 0.8:
-            return "🟡"  # Near complete (80%+)
-        elif completion_rate >= 0.5:
-            return "🟠"  # Partial (50%+)
-        elif completion_rate > 0:
-            return "🔴"  # Started but low
-        else:
-            return "⚪"  # Not started
-    
-    def render_order_card(supplier, animal_type, variant, ordered_qty, delivered_qty, outbound_qty, remaining_qty, delivery_count, completion_rate, inbound_df, selected_general_animal):
-        """Render enhanced order card using Streamlit native components with text instead of tables"""
-        
-        status_icon = get_status_color(delivered_qty, ordered_qty)
-        
-        # Determine progress color (green-based with red for 0%)
-        if completion_rate == 0:
-            progress_color = "#dc3545"  # Red for 0%
-        elif completion_rate < 25:
-            progress_color = "#fd7e14"  # Orange for low progress
-        elif completion_rate < 50:
-            progress_color = "#ffc107"  # Yellow for medium-low
-        elif completion_rate < 75:
-            progress_color = "#20c997"  # Teal for medium-high
-        else:
-            progress_color = "#198754"  # Green for high progress
-        
-        # Format title with title case
-        def title_case(text):
-            return ' '.join(word.capitalize() for word in text.split())
-        
-        formatted_supplier = title_case(supplier)
-        formatted_variant = title_case(variant)
-        
-        # Use Streamlit container with custom CSS
-        with st.container():
-            # Card content using Streamlit components
-            with st.container():
-                # Header row - supplier | variant format with title case, lower heading level
-                st.markdown(f"##### {status_icon} {formatted_supplier} | {formatted_variant}")
-                
-                # Progress bar with bigger percentage and green-based coloring
-                progress_value = min(1.0, max(0.0, completion_rate / 100))
-                st.progress(progress_value)
-                st.markdown(f"<div style='text-align: center; margin-top: -10px;'><h2 style='margin: 0; color: {progress_color};'>{completion_rate:.1f}% selesai</h2></div>", unsafe_allow_html=True)
-                
-                # Metrics as text in columns instead of table
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("Dipesan", int(ordered_qty))
-                
-                with col2:
-                    st.metric("Diterima", int(delivered_qty))
-                
-                with col3:
-                    st.metric("Sisa", int(remaining_qty))
-
-                st.markdown("---")
-    
-    def render_vendor_summary_card(supplier, animal_type, filtered_data, inbound_df, selected_general_animal):
-        """Render vendor summary card with kedatangan info"""
-        
-        # Calculate totals for this vendor
-        vendor_data = filtered_data[filtered_data['supplier'] == supplier]
-        if animal_type != "Semua":
-            vendor_data = vendor_data[vendor_data['animal_type'] == animal_type]
-        
-        total_ordered = vendor_data['ordered_quantity'].sum()
-        total_delivered = vendor_data['total_delivered'].sum()
-        total_outbound = vendor_data['total_outbound'].sum()
-        total_remaining = vendor_data['remaining_quantity'].sum()
-        total_delivery_count = vendor_data['delivery_count'].sum()
-        completion_rate = (total_delivered / total_ordered * 100) if total_ordered > 0 else 0
-        
-        # Determine status
-        status_icon = get_status_color(total_delivered, total_ordered)
-        
-        # Determine progress color (green-based with red for 0%)
-        if completion_rate == 0:
-            progress_color = "#dc3545"  # Red for 0%
-        elif completion_rate < 25:
-            progress_color = "#fd7e14"  # Orange for low progress
-        elif completion_rate < 50:
-            progress_color = "#ffc107"  # Yellow for medium-low
-        elif completion_rate < 75:
-            progress_color = "#20c997"  # Teal for medium-high
-        else:
-            progress_color = "#198754"  # Green for high progress
-        
-        # Format title with title case
-        def title_case(text):
-            return ' '.join(word.capitalize() for word in text.split())
-        
-        formatted_supplier = title_case(supplier)
-        
-        with st.container():
-            # Header - supplier only, title case, no caps
-            st.markdown(f"#### {status_icon} {formatted_supplier}")
-            
-            # Progress bar with bigger percentage and green-based coloring
-            progress_value = min(1.0, max(0.0, completion_rate / 100))
-            st.progress(progress_value)
-            st.markdown(f"<div style='text-align: center; margin-top: -10px;'><h2 style='margin: 0; color: {progress_color};'>{completion_rate:.1f}% selesai</h2></div>", unsafe_allow_html=True)
-            
-            # Metrics using st.metric for better visualization
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Dipesan", f"{int(total_ordered)} ekor")
-            
-            with col2:
-                st.metric("Diterima", f"{int(total_delivered)} ekor")
-            
-            with col3:
-                st.metric("Sisa", f"{int(total_remaining)} ekor")
-            
-            st.markdown("---")
-    
-    def get_daily_arrivals(inbound_df, supplier=None, animal_type=None, variant=None, selected_animal=None):
-        """Get daily arrival data for supplier and/or category"""
-        if inbound_df.empty:
-            return pd.DataFrame()
-        
-        try:
-            # Get column names
-            animal_type_col = config.get_column_name("inbound", 2)  # "Tipe Hewan"
-            supplier_col = config.get_column_name("inbound", 3)     # "Supplier"
-            variant_col = config.get_column_name("inbound", 4)      # "Varian"
-            quantity_col = config.get_column_name("inbound", 5)     # "Quantity"
-            date_col = config.get_column_name("inbound", 10)        # "Tanggal Pengiriman"
-            timestamp_col = config.get_column_name("inbound", 0)    # "Timestamp"
-            
-            # Clean data
-            df_clean = inbound_df.copy()
-            df_clean[quantity_col] = pd.to_numeric(df_clean[quantity_col], errors='coerce').fillna(0)
-            
-            # Filter by selected general animal
-            if selected_animal and selected_animal != "Semua":
-                df_clean = df_clean[df_clean[animal_type_col] == selected_animal]
-            
-            # Filter by supplier if specified
-            if supplier and supplier != "Semua":
-                df_clean = df_clean[df_clean[supplier_col] == supplier]
-            
-            # Filter by animal type if specified
-            if animal_type and animal_type != "Semua":
-                df_clean = df_clean[df_clean[animal_type_col] == animal_type]
-            
-            # Filter by variant if specified
-            if variant:
-                df_clean = df_clean[df_clean[variant_col] == variant]
-            
-            if df_clean.empty:
-                return pd.DataFrame()
-            
-            # Extract date from delivery date or timestamp
-            df_clean['date'] = pd.to_datetime(df_clean[date_col] if date_col and not df_clean[date_col].isna().all() else df_clean[timestamp_col], errors='coerce').dt.date
-            
-            # Group by date and sum quantities
-            daily_data = df_clean.groupby('date')[quantity_col].sum().reset_index()
-            daily_data.columns = ['date', 'quantity']
-            
-            # Sort by date descending to show latest first
-            daily_data = daily_data.sort_values('date', ascending=False)
-            
-            return daily_data
-            
-        except (KeyError, AttributeError) as e:
-            if debug_mode:
-                st.error(f"Error processing daily arrivals: {e}")
-            return pd.DataFrame()
-    
     # Process and display orders
     if not inbound_df.empty or not outbound_df.empty:
-        order_data = process_order_data(inbound_df, outbound_df, selected_general_animal)
+        order_data = process_order_data(inbound_df, OUT_BY_ANIMAL)
+        
+        # Narrow the cached all-animal summary to the selected animal
+        if selected_general_animal != "Semua" and not order_data.empty:
+            order_data = order_data[order_data['animal_type'] == selected_general_animal]
         
         if not order_data.empty:
             # Filter controls - updated based on selected animal
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                suppliers = ['Semua'] + sorted(order_data['supplier'].unique().tolist())
+                suppliers = ['Semua'] + order_data['supplier'].drop_duplicates().sort_values().tolist()
                 selected_supplier = st.selectbox("Filter Supplier", suppliers)
             
             with col2:
                 # Use specific variants instead of high-level animal types
                 if selected_general_animal == "Semua":
-                    variants = ['Semua'] + sorted(order_data['variant'].unique().tolist())
+                    variants = ['Semua'] + order_data['variant'].drop_duplicates().sort_values().tolist()
                 else:
                     # Filter variants based on selected general animal
-                    filtered_variants = order_data[order_data['animal_type'] == selected_general_animal]['variant'].unique()
-                    variants = ['Semua'] + sorted(filtered_variants.tolist())
+                    filtered_variants = order_data.loc[order_data['animal_type'] == selected_general_animal, 'variant']
+                    variants = ['Semua'] + filtered_variants.drop_duplicates().sort_values().tolist()
                 selected_variant = st.selectbox("Filter Varian", variants)
             
             with col3:
-                status_options = ['Semua', '🟢 100%', '🟡 50-99%', '🔴 0-49%']
+                status_options = ['Semua'] + list(STATUS_BINS)
                 selected_status = st.selectbox("Filter Status", status_options)
             
-            # Apply filters
-            filtered_data = order_data.copy()
+            # Apply filters as one combined mask
+            mask = np.ones(len(order_data), dtype=bool)
             
             if selected_supplier != 'Semua':
-                filtered_data = filtered_data[filtered_data['supplier'] == selected_supplier]
+                mask &= (order_data['supplier'] == selected_supplier).to_numpy()
             
             # Use variant filter instead of animal type filter
             if selected_variant != 'Semua':
-                filtered_data = filtered_data[filtered_data['variant'] == selected_variant]
+                mask &= (order_data['variant'] == selected_variant).to_numpy()
             
             # Apply status filter
             if selected_status != 'Semua':
-                if selected_status == '🟢 100%':
-                    filtered_data = filtered_data[filtered_data['completion_rate'] >= 100]
-                elif selected_status == '🟡 50-99%':
-                    filtered_data = filtered_data[
-                        (filtered_data['completion_rate'] >= 50) & 
-                        (filtered_data['completion_rate'] < 100)
-                    ]
-                elif selected_status == '🔴 0-49%':
-                    filtered_data = filtered_data[filtered_data['completion_rate'] < 50]
+                mask &= order_data['status_bin'].to_numpy() == STATUS_BINS[selected_status]
+            
+            filtered_data = order_data.loc[mask]
             
             # Display summary metrics in 2 columns
             col1, col2 = st.columns(2)
             
+            # All three totals come from one column-wise sum
+            total_delivered, total_ordered, total_remaining = (
+                filtered_data[['total_delivered', 'ordered_quantity', 'remaining_quantity']].sum().to_numpy()
+            )
+            
             with col1:
                 st.metric("Total Pesanan", len(filtered_data))
-                total_delivered = filtered_data['total_delivered'].sum()
                 st.metric("Total Diterima", f"{int(total_delivered)} ekor")
             
             with col2:
-                total_ordered = filtered_data['ordered_quantity'].sum()
                 st.metric("Total Dipesan", f"{int(total_ordered)} ekor")
-                total_remaining = filtered_data['remaining_quantity'].sum()
                 completion_rate = (total_delivered / total_ordered * 100) if total_ordered > 0 else 0
                 st.metric("Sisa Pesanan", f"{int(total_remaining)} ekor", 
                          delta=f"{completion_rate:.1f}% selesai")
@@ -717,69 +674,34 @@ with tab2:
             st.markdown("#### 📈 Progress Kedatangan")
             
             # Get kedatangan data based on filters
-            kedatangan_data = {}
-            try:
-                if not inbound_df.empty:
-                    quantity_col = config.get_column_name("inbound", 5)      # "Quantity"
-                    supplier_col = config.get_column_name("inbound", 3)      # "Supplier"  
-                    variant_col = config.get_column_name("inbound", 4)       # "Varian"
-                    animal_type_col = config.get_column_name("inbound", 2)   # "Tipe Hewan"
-                    date_col = config.get_column_name("inbound", 10)         # "Tanggal Pengiriman"
-                    timestamp_col = config.get_column_name("inbound", 0)     # "Timestamp"
+            kedatangan_quantities = [0] * len(TARGET_DAYS)
+            if not inbound_df.empty:
+                quantity_col = InboundCols.QUANTITY
+                supplier_col = InboundCols.SUPPLIER
+                variant_col = InboundCols.VARIANT
+                animal_type_col = InboundCols.ANIMAL_TYPE
+                date_col = InboundCols.DELIVERY_DATE
+                timestamp_col = InboundCols.TIMESTAMP
                     
-                    if quantity_col and quantity_col in inbound_df.columns:
-                        filtered_kedatangan_df = inbound_df.copy()
-                        
-                        # Apply same filters as the order display
-                        if selected_supplier != 'Semua' and supplier_col and supplier_col in filtered_kedatangan_df.columns:
-                            filtered_kedatangan_df = filtered_kedatangan_df[filtered_kedatangan_df[supplier_col] == selected_supplier]
+                if quantity_col and quantity_col in inbound_df.columns:
+                    # Apply same filters as the order display, combined into one mask
+                    kedatangan_mask = np.ones(len(inbound_df), dtype=bool)
+                    if selected_supplier != 'Semua' and supplier_col and supplier_col in inbound_df.columns:
+                        kedatangan_mask &= (inbound_df[supplier_col] == selected_supplier).to_numpy()
                         
-                        if selected_variant != 'Semua' and variant_col and variant_col in filtered_kedatangan_df.columns:
-                            filtered_kedatangan_df = filtered_kedatangan_df[filtered_kedatangan_df[variant_col] == selected_variant]
+                    if selected_variant != 'Semua' and variant_col and variant_col in inbound_df.columns:
+                        kedatangan_mask &= (inbound_df[variant_col] == selected_variant).to_numpy()
                         
-                        # Filter by selected general animal
-                        if selected_general_animal != "Semua" and animal_type_col and animal_type_col in filtered_kedatangan_df.columns:
-                            filtered_kedatangan_df = filtered_kedatangan_df[filtered_kedatangan_df[animal_type_col] == selected_general_animal]
+                    # Filter by selected general animal
+                    if selected_general_animal != "Semua" and animal_type_col and animal_type_col in inbound_df.columns:
+                        kedatangan_mask &= (inbound_df[animal_type_col] == selected_general_animal).to_numpy()
                         
-                        if not filtered_kedatangan_df.empty:
-                            date_column_to_use = date_col if date_col and date_col in filtered_kedatangan_df.columns and not filtered_kedatangan_df[date_col].isna().all() else timestamp_col
-                            
-                            if date_column_to_use and date_column_to_use in filtered_kedatangan_df.columns:
-                                filtered_kedatangan_df['date'] = pd.to_datetime(filtered_kedatangan_df[date_column_to_use], errors='coerce').dt.date
-                                filtered_kedatangan_df = filtered_kedatangan_df.dropna(subset=['date'])
-                                
-                                if not filtered_kedatangan_df.empty:
-                                    filtered_kedatangan_df[quantity_col] = pd.to_numeric(filtered_kedatangan_df[quantity_col], errors='coerce').fillna(0)
-                                    daily_kedatangan = filtered_kedatangan_df.groupby('date')[quantity_col].sum().reset_index()
-                                    daily_kedatangan = daily_kedatangan.sort_values('date')
-                                    
-                                    for _, row in daily_kedatangan.iterrows():
-                                        date_str = row['date'].strftime('%d/%m') if hasattr(row['date'], 'strftime') else str(row['date'])
-                                        kedatangan_data[date_str] = int(row[quantity_col])
-            except:
-                pass
+                    filtered_kedatangan_df = inbound_df.loc[kedatangan_mask]
+                    kedatangan_quantities = target_day_totals(filtered_kedatangan_df, date_col, timestamp_col, quantity_col, TARGET_DAYS)
             
-            # Create kedatangan chart
-            target_dates = ["02/06", "03/06", "04/06", "05/06", "06/06", "07/06", "08/06"]
-            kedatangan_quantities = [kedatangan_data.get(date, 0) for date in target_dates]
             
             # Create bar chart using plotly
-            fig = px.bar(
-                y=kedatangan_quantities,
-                x=target_dates,
-                orientation='v',
-                labels={'y': 'Jumlah (ekor)', 'x': 'Tanggal'},
-                title='Kedatangan Harian (Berdasarkan Filter)'
-            )
-            
-            # Update layout for better visualization
-            fig.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=40, b=20),
-                showlegend=False
-            )
-            
-            # Display the chart
+            fig = daily_progress_figure(TARGET_DATES, tuple(kedatangan_quantities), 'Kedatangan Harian (Berdasarkan Filter)')
             st.plotly_chart(fig, use_container_width=True)
             
             st.markdown("---")
@@ -795,122 +717,49 @@ with tab2:
                 # Group display by vendor for better organization
                 if selected_supplier == 'Semua':
                     # Show vendor summary cards when viewing all suppliers
-                    vendors = filtered_data['supplier'].unique()
+                    # One aggregate per vendor feeds both the sort and the summary cards
+                    # Totals cover the same filtered rows as the detail cards below, so a
+                    # variant filter narrows them to that variant rather than zeroing them
+                    vendor_totals = filtered_data.groupby('supplier', sort=False, observed=True).agg(
+                        total_ordered=('ordered_quantity', 'sum'),
+                        total_delivered=('total_delivered', 'sum'),
+                        total_outbound=('total_outbound', 'sum'),
+                        total_remaining=('remaining_quantity', 'sum'),
+                        total_delivery_count=('delivery_count', 'sum'),
+                        supplier_display=('supplier_display', 'first')
+                    )
+                    vendor_totals['completion_rate'] = np.where(
+                        vendor_totals['total_ordered'] > 0,
+                        vendor_totals['total_delivered'] / vendor_totals['total_ordered'] * 100,
+                        0
+                    )
                     
                     # Sort vendors by their overall completion rate (DESCENDING)
-                    vendor_completion_rates = []
-                    for vendor in vendors:
-                        vendor_data = filtered_data[filtered_data['supplier'] == vendor]
-                        total_ordered = vendor_data['ordered_quantity'].sum()
-                        total_delivered = vendor_data['total_delivered'].sum()
-                        vendor_completion = (total_delivered / total_ordered * 100) if total_ordered > 0 else 0
-                        vendor_completion_rates.append((vendor, vendor_completion))
-                    
-                    # Sort by completion rate (DESCENDING - highest first)
-                    vendor_completion_rates.sort(key=lambda x: x[1], reverse=True)
-                    vendors = [vendor for vendor, _ in vendor_completion_rates]
+                    # Stable sort keeps vendors with equal rates in order of first appearance
+                    vendor_totals = vendor_totals.sort_values('completion_rate', ascending=False, kind='stable')
+                    vendor_rows = dict(list(filtered_data.groupby('supplier', sort=False, observed=True)))
                     
-                    for vendor in vendors:
-                        vendor_filtered_data = filtered_data[filtered_data['supplier'] == vendor]
+                    for vendor_summary in vendor_totals.itertuples(name='VendorTotals'):
+                        vendor = vendor_summary.Index
+                        vendor_filtered_data = vendor_rows[vendor]
                         
                         # Sort vendor's data by completion rate (DESCENDING)
                         vendor_filtered_data = vendor_filtered_data.sort_values(['completion_rate'], ascending=[False])
                         
                         # Show vendor summary card
-                        actual_animal_filter = selected_variant if selected_general_animal == "Semua" else selected_general_animal
-                        render_vendor_summary_card(
-                            vendor, 
-                            actual_animal_filter, 
-                            vendor_filtered_data, 
-                            inbound_df, 
-                            selected_general_animal
-                        )
+                        render_vendor_summary_card(vendor_summary)
                         
                         # Show individual variant cards for this vendor in 2 columns
                         st.markdown(f"#### Detail pesanan {vendor}")
                         
                         # Use 2 columns for variant cards
-                        variant_rows = list(vendor_filtered_data.iterrows())
-                        for i in range(0, len(variant_rows), 2):
-                            col1, col2 = st.columns(2)
-                            
-                            # First card
-                            with col1:
-                                _, row = variant_rows[i]
-                                render_order_card(
-                                    row['supplier'],
-                                    row['animal_type'],
-                                    row['variant'],
-                                    row['ordered_quantity'],
-                                    row['total_delivered'],
-                                    row['total_outbound'],
-                                    row['remaining_quantity'],
-                                    row['delivery_count'],
-                                    row['completion_rate'],
-                                    inbound_df,
-                                    selected_general_animal
-                                )
-                            
-                            # Second card (if exists)
-                            if i + 1 < len(variant_rows):
-                                with col2:
-                                    _, row = variant_rows[i + 1]
-                                    render_order_card(
-                                        row['supplier'],
-                                        row['animal_type'],
-                                        row['variant'],
-                                        row['ordered_quantity'],
-                                        row['total_delivered'],
-                                        row['total_outbound'],
-                                        row['remaining_quantity'],
-                                        row['delivery_count'],
-                                        row['completion_rate'],
-                                        inbound_df,
-                                        selected_general_animal
-                                    )
+                        render_order_cards(vendor_filtered_data)
                         
                         st.markdown("<br>", unsafe_allow_html=True)
                 
                 else:
                     # Show individual cards for specific supplier in 2 columns
-                    variant_rows = list(filtered_data.iterrows())
-                    for i in range(0, len(variant_rows), 2):
-                        col1, col2 = st.columns(2)
-                        
-                        # First card
-                        with col1:
-                            _, row = variant_rows[i]
-                            render_order_card(
-                                row['supplier'],
-                                row['animal_type'],
-                                row['variant'],
-                                row['ordered_quantity'],
-                                row['total_delivered'],
-                                row['total_outbound'],
-                                row['remaining_quantity'],
-                                row['delivery_count'],
-                                row['completion_rate'],
-                                inbound_df,
-                                selected_general_animal
-                            )
-                        
-                        # Second card (if exists)
-                        if i + 1 < len(variant_rows):
-                            with col2:
-                                _, row = variant_rows[i + 1]
-                                render_order_card(
-                                    row['supplier'],
-                                    row['animal_type'],
-                                    row['variant'],
-                                    row['ordered_quantity'],
-                                    row['total_delivered'],
-                                    row['total_outbound'],
-                                    row['remaining_quantity'],
-                                    row['delivery_count'],
-                                    row['completion_rate'],
-                                    inbound_df,
-                                    selected_general_animal
-                                )
+                    render_order_cards(filtered_data)
             
             else:
                 st.info("Tidak ada pesanan yang sesuai dengan filter yang dipilih.")
@@ -919,4 +768,10 @@ with tab2:
             st.info("Belum ada data pesanan yang dapat ditampilkan.")
     
     else:
-        st.info("Belum ada data masuk yang tercatat. Silakan mulai dengan mencatat hewan masuk.") 
\ No newline at end of file
+        st.info("Belum ada data masuk yang tercatat. Silakan mulai dengan mencatat hewan masuk.")
+
+with tab1:
+    render_stock_summary_tab(inbound_df, outbound_df)
+
+with tab2:
+    render_order_status_tab(inbound_df, outbound_df)
@@ -1,53 +1,106 @@
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+
+# Try to import orjson, fallback to the stdlib parser if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _col_letter(index: int) -> str:
+    """Convert a 0-based column index to its A1 letters (0 -> A, 25 -> Z, 26 -> AA)"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _freeze(value: Any) -> Any:
+    """Turn parsed JSON into read-only views (dicts to MappingProxyType, lists to tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+CONFIG_DIR = "config"
 
 class ConfigHelper:
+    CONFIG_FILES = ("vendors.json", "animals.json", "sheets.json", "ui_labels.json")
+    # Config file paths, joined once at import
+    _PATHS = {name: os.path.join(CONFIG_DIR, name) for name in CONFIG_FILES}
+    
     def __init__(self):
-        self.config_dir = "config"
-        self._vendors = None
-        self._animals = None
-        self._sheets = None
-        self._ui_labels = None
+        self.config_dir = CONFIG_DIR
+        # Load every config up front; the helper is a single cached instance
+        # The four files are independent, so they are read and parsed concurrently
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # Getters hand out shared read-only views, so callers can't mutate the cached configs
+            self._vendors, self._animals, self._sheets, self._ui_labels = (
+                map(_freeze, pool.map(self._load_json, self.CONFIG_FILES))
+            )
+        
+        # Vendor orders keyed by order category, first occurrence wins like the old linear scan
+        self._orders_by_category = {}
+        for order_key, orders in self.get_animal_orders().items():
+            categories = self._orders_by_category.setdefault(order_key, {})
+            for order in orders:
+                categories.setdefault(order["category"], order.get("vendors", {}))
+        self._category_matches = {}
+        self._hari_options = {}
+        self._supplier_totals = {}
+        
+        # Column name -> index per sheet type, for constant-time get_column_index
+        self._column_indexes = {}
+        for sheet_type, columns in self.sheets.get("columns", {}).items():
+            indexes = self._column_indexes[sheet_type] = {}
+            for index, column_name in enumerate(columns):
+                # First occurrence wins, same as list.index
+                indexes.setdefault(column_name, index)
     
     def _load_json(self, filename: str) -> Dict[str, Any]:
         """Load JSON configuration file"""
-        filepath = os.path.join(self.config_dir, filename)
+        filepath = self._PATHS[filename]
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # One unbuffered read of the whole file; both parsers take UTF-8 bytes
+            fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                raw = os.read(fd, os.fstat(fd).st_size)
+            finally:
+                os.close(fd)
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file {filepath} not found")
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError subclasses this one
             raise ValueError(f"Invalid JSON in {filepath}: {e}")
+        return data
     
     @property
     def vendors(self) -> Dict[str, List[str]]:
         """Get vendor configurations"""
-        if self._vendors is None:
-            self._vendors = self._load_json("vendors.json")
         return self._vendors
     
     @property
     def animals(self) -> Dict[str, List[str]]:
         """Get animal configurations"""
-        if self._animals is None:
-            self._animals = self._load_json("animals.json")
         return self._animals
     
     @property
     def sheets(self) -> Dict[str, Any]:
         """Get sheet configurations"""
-        if self._sheets is None:
-            self._sheets = self._load_json("sheets.json")
         return self._sheets
     
     @property
     def ui_labels(self) -> Dict[str, Any]:
         """Get UI label configurations"""
-        if self._ui_labels is None:
-            self._ui_labels = self._load_json("ui_labels.json")
         return self._ui_labels
     
     # Convenience methods for commonly used configs
@@ -70,26 +123,29 @@ class ConfigHelper:
         """Get sheet name by type (inbound/outbound)"""
         return self.sheets["sheet_names"][sheet_type]
     
-    def get_hari_h_date(self, form_type: str = "inbound") -> datetime:
+    def get_hari_h_date(self, form_type: str = "inbound") -> date:
         """Get Hari H date for the specified form type"""
         if form_type == "outbound":
             date_str = self.sheets["date_config"]["hari_h_outbound"]
         else:
             date_str = self.sheets["date_config"]["hari_h"]
-        return datetime.strptime(date_str, "%Y-%m-%d").date()
+        return date.fromisoformat(date_str)
     
     def get_hari_options(self, form_type: str = "inbound") -> Dict[str, datetime]:
         """Generate Hari options based on Hari H"""
-        hari_h = self.get_hari_h_date(form_type)
-        return {
-            "H-4": hari_h - timedelta(days=4),
-            "H-3": hari_h - timedelta(days=3),
-            "H-2": hari_h - timedelta(days=2),
-            "H-1": hari_h - timedelta(days=1),
-            "H": hari_h,
-            "H+1": hari_h + timedelta(days=1),
-            "H+2": hari_h + timedelta(days=2)
-        }
+        # Built once per form type and shared read-only
+        if form_type not in self._hari_options:
+            hari_h = self.get_hari_h_date(form_type)
+            self._hari_options[form_type] = MappingProxyType({
+                "H-4": hari_h - timedelta(days=4),
+                "H-3": hari_h - timedelta(days=3),
+                "H-2": hari_h - timedelta(days=2),
+                "H-1": hari_h - timedelta(days=1),
+                "H": hari_h,
+                "H+1": hari_h + timedelta(days=1),
+                "H+2": hari_h + timedelta(days=2)
+            })
+        return self._hari_options[form_type]
     
     def get_form_labels(self, form_type: str) -> Dict[str, Any]:
         """Get form labels for the specified form type"""
@@ -119,11 +175,7 @@ class ConfigHelper:
     
     def get_column_index(self, sheet_type: str, column_name: str) -> int:
         """Get column index by name"""
-        columns = self.get_sheet_columns(sheet_type)
-        try:
-            return columns.index(column_name)
-        except ValueError:
-            return -1
+        return self._column_indexes.get(sheet_type, {}).get(column_name, -1)
     
     def get_sheet_range(self, sheet_type: str, start_row: int = 1) -> str:
         """Get full sheet range based on column count"""
@@ -132,9 +184,8 @@ class ConfigHelper:
         if not columns:
             return f"{sheet_name}!A{start_row}:Z"  # Fallback to wide range
         
-        # Calculate end column letter (A=0, B=1, etc.)
-        end_col_index = len(columns) - 1
-        end_col_letter = chr(65 + end_col_index)
+        # Calculate end column letter (A=0, B=1, ..., AA=26)
+        end_col_letter = _col_letter(len(columns) - 1)
         
         return f"{sheet_name}!A{start_row}:{end_col_letter}"
     
@@ -142,57 +193,49 @@ class ConfigHelper:
         """Get all animal order data"""
         return self.animals.get("animal_orders", {})
     
+    def _match_order_category(self, animal_type: str, category: str) -> Tuple[str, Optional[str]]:
+        """Resolve the order category a full category name belongs to, memoized per name"""
+        order_key = "Domba" if animal_type == "Domba/Kambing" else "Sapi"
+        key = (order_key, category)
+        if key not in self._category_matches:
+            # First order category that prefixes the name wins
+            self._category_matches[key] = next(
+                (order_category for order_category in self._orders_by_category.get(order_key, {})
+                 if category.startswith(order_category)),
+                None
+            )
+        return order_key, self._category_matches[key]
+    
     def get_order_data_for_supplier_and_category(self, animal_type: str, supplier: str, category: str) -> int:
         """Get ordered quantity for specific supplier and category"""
-        orders = self.get_animal_orders()
-        
-        # Map animal type to order key
-        order_key = "Domba" if animal_type == "Domba/Kambing" else "Sapi"
-        
-        if order_key not in orders:
+        order_key, order_category = self._match_order_category(animal_type, category)
+        if order_category is None:
             return 0
-        
-        # Find matching category
-        for order in orders[order_key]:
-            # Clean category name for comparison
-            order_category = order["category"]
-            if category.startswith(order_category):
-                vendors = order.get("vendors", {})
-                return vendors.get(supplier, 0)
-        
-        return 0
+        return self._orders_by_category[order_key][order_category].get(supplier, 0)
+    
+    def get_order_category(self, animal_type: str, category: str) -> str:
+        """Get the order category that a full category name belongs to"""
+        order_category = self._match_order_category(animal_type, category)[1]
+        return "" if order_category is None else order_category
     
     def get_total_orders_by_animal_type(self, animal_type: str) -> Dict[str, int]:
         """Get total orders grouped by supplier for an animal type"""
-        orders = self.get_animal_orders()
         order_key = "Domba" if animal_type == "Domba/Kambing" else "Sapi"
         
-        if order_key not in orders:
-            return {}
+        # Totals only depend on the loaded config, so they are summed once per order key
+        if order_key not in self._supplier_totals:
+            supplier_totals = Counter()
+            for order in self.get_animal_orders().get(order_key, ()):
+                # Skip empty vendor names and zero orders
+                supplier_totals.update({vendor: quantity for vendor, quantity in order.get("vendors", {}).items()
+                                        if vendor and quantity > 0})
+            self._supplier_totals[order_key] = MappingProxyType(dict(supplier_totals))
         
-        supplier_totals = {}
-        for order in orders[order_key]:
-            vendors = order.get("vendors", {})
-            for vendor, quantity in vendors.items():
-                if vendor and quantity > 0:  # Skip empty vendor names
-                    if vendor not in supplier_totals:
-                        supplier_totals[vendor] = 0
-                    supplier_totals[vendor] += quantity
-        
-        return supplier_totals
+        return self._supplier_totals[order_key]
     
     def get_category_orders(self, animal_type: str, category: str) -> Dict[str, int]:
         """Get orders for specific category across all vendors"""
-        orders = self.get_animal_orders()
-        order_key = "Domba" if animal_type == "Domba/Kambing" else "Sapi"
-        
-        if order_key not in orders:
+        order_key, order_category = self._match_order_category(animal_type, category)
+        if order_category is None:
             return {}
-        
-        # Find matching category
-        for order in orders[order_key]:
-            order_category = order["category"]
-            if category.startswith(order_category):
-                return order.get("vendors", {})
-        
-        return {} 
\ No newline at end of file
+        return self._orders_by_category[order_key][order_category]
@@ -1,11 +1,21 @@
 import streamlit as st
 import os
+from collections.abc import Mapping
 from typing import Dict, Any
 
+def _to_plain_dict(section) -> Dict[str, Any]:
+    """Copy a secrets section into nested plain dicts"""
+    return {k: _to_plain_dict(v) if isinstance(v, Mapping) else v for k, v in section.items()}
+
+# Dotted secret names split into key paths, filled on first use
+_SECRET_KEY_PATHS: Dict[str, tuple] = {}
+
 class EnvironmentHelper:
     """Simple helper for managing development and production environments"""
     
     def __init__(self):
+        # Read st.secrets once; every lookup below uses this plain snapshot
+        self._secrets = _to_plain_dict(st.secrets)
         self.current_env = self._detect_environment()
         self.config = self._load_config()
     
@@ -13,8 +23,9 @@ class EnvironmentHelper:
         """Detect environment based on configuration"""
         
         # Method 1: Explicit environment setting in secrets
-        if "app" in st.secrets and "current_environment" in st.secrets["app"]:
-            return st.secrets["app"]["current_environment"]
+        secrets = self._secrets
+        if "app" in secrets and "current_environment" in secrets["app"]:
+            return secrets["app"]["current_environment"]
         
         # Method 2: Environment variable override
         env_var = os.getenv('STREAMLIT_ENV')
@@ -31,13 +42,14 @@ class EnvironmentHelper:
             "debug_mode": False,
             "google": {}
         }
+        secrets = self._secrets
         
         try:
             # Environment-specific sections (Recommended)
-            if ("environments" in st.secrets and 
-                self.current_env in st.secrets["environments"]):
+            if ("environments" in secrets and 
+                self.current_env in secrets["environments"]):
                 
-                env_config = st.secrets["environments"][self.current_env]
+                env_config = secrets["environments"][self.current_env]
                 
                 # Load Google config
                 if "google" in env_config:
@@ -49,10 +61,10 @@ class EnvironmentHelper:
             
             # Fallback to base configuration
             else:
-                if "google" in st.secrets:
-                    config["google"] = dict(st.secrets["google"])
-                if "app" in st.secrets:
-                    config.update(st.secrets["app"])
+                if "google" in secrets:
+                    config["google"] = dict(secrets["google"])
+                if "app" in secrets:
+                    config.update(secrets["app"])
                     
         except Exception as e:
             st.error(f"Error loading environment configuration: {e}")
@@ -89,15 +101,17 @@ class EnvironmentHelper:
         missing_secrets = []
         
         for secret_key in required_secrets:
-            keys = secret_key.split(".")
+            keys = _SECRET_KEY_PATHS.get(secret_key)
+            if keys is None:
+                keys = _SECRET_KEY_PATHS[secret_key] = tuple(secret_key.split("."))
             current = self.config
             
-            try:
-                for k in keys:
-                    current = current[k]
-                if not current:
-                    missing_secrets.append(secret_key)
-            except (KeyError, TypeError):
+            # Walk with dict.get so a missing key is a plain check, not an exception
+            for k in keys:
+                current = current.get(k) if isinstance(current, dict) else None
+                if current is None:
+                    break
+            if not current:
                 missing_secrets.append(secret_key)
         
         if missing_secrets:
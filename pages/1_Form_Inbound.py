@@ -1,11 +1,14 @@
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import os
-from sheets_helper import GoogleHelper
+from typing import Any, Mapping, NamedTuple, Sequence
+from sheets_helper import get_google_helper
 from config_helper import ConfigHelper
 from environment_helper import get_environment_helper
-import time
-import pytz
+from zoneinfo import ZoneInfo
+
+# West Indonesia Time (UTC+7)
+WIB = ZoneInfo("Asia/Jakarta")
 
 # Initialize environment helper (cached)
 env_helper = get_environment_helper()
@@ -34,10 +37,39 @@ env_helper.show_environment_info(show_in_sidebar=True)
 def init_config():
     return ConfigHelper()
 
-# Initialize Google helper
+class FormConstants(NamedTuple):
+    inbound_range: str
+    animal_types: Sequence[str]
+    sheep_categories: Sequence[str]
+    cow_categories: Sequence[str]
+    sheep_vendors: Sequence[str]
+    cow_vendors: Sequence[str]
+    hari_options: Mapping[str, date]
+    hari_h: date
+    form_labels: Mapping[str, Any]
+
+# Resolve everything the form needs from the config once, not on every rerun
 @st.cache_resource
-def init_helper():
-    return GoogleHelper(GOOGLE_CREDENTIALS_FILE)
+def load_form_constants():
+    config = init_config()
+    return FormConstants(
+        inbound_range=config.get_sheet_range("inbound"),
+        animal_types=config.get_animal_types(),
+        sheep_categories=config.get_sheep_categories(),
+        cow_categories=config.get_cow_categories(),
+        sheep_vendors=config.get_sheep_vendors(),
+        cow_vendors=config.get_cow_vendors(),
+        hari_options=config.get_hari_options("inbound"),
+        hari_h=config.get_hari_h_date("inbound"),
+        form_labels=config.get_form_labels("inbound")
+    )
+
+# One pending row of the form, kept as a compact tuple in session state
+class InboundEntry(NamedTuple):
+    animal_type: str
+    supplier: str
+    variant: str
+    quantity: int
 
 if not SPREADSHEET_ID or not DRIVE_FOLDER_ID:
     st.error("Missing required configuration. Please check your .streamlit/secrets.toml file.")
@@ -52,27 +84,35 @@ if debug_mode:
 config = init_config()
 
 # Load configurations from JSON files
-INBOUND_RANGE = config.get_sheet_range("inbound")
-ANIMAL_TYPES = config.get_animal_types()
-SHEEP_CATEGORIES = config.get_sheep_categories()
-COW_CATEGORIES = config.get_cow_categories()
-SHEEP_VENDORS = config.get_sheep_vendors()
-COW_VENDORS = config.get_cow_vendors()
-HARI_OPTIONS = config.get_hari_options("inbound")
-HARI_H = config.get_hari_h_date("inbound")
+FORM = load_form_constants()
+INBOUND_RANGE = FORM.inbound_range
+ANIMAL_TYPES = FORM.animal_types
+SHEEP_CATEGORIES = FORM.sheep_categories
+COW_CATEGORIES = FORM.cow_categories
+SHEEP_VENDORS = FORM.sheep_vendors
+COW_VENDORS = FORM.cow_vendors
+HARI_OPTIONS = FORM.hari_options
+HARI_H = FORM.hari_h
+# Hari selectbox options and help text never change while the app runs
+HARI_LABELS = tuple(HARI_OPTIONS)
+HARI_H_TEXT = HARI_H.strftime('%d %B %Y')
 
 # Get form labels
-form_labels = config.get_form_labels("inbound")
+form_labels = FORM.form_labels
 
 st.header(form_labels["title"])
 
 # Initialize helper
-helper = init_helper()
+helper = get_google_helper(GOOGLE_CREDENTIALS_FILE)
 
 # Initialize session state for animal entries if not exists
 if 'animal_entries' not in st.session_state:
     st.session_state.animal_entries = []
 
+# Show the success message left by the previous submit
+if 'flash_message' in st.session_state:
+    st.toast(st.session_state.pop('flash_message'), icon='✅')
+
 # Animal type selection outside the form
 animal_type = st.selectbox(
     "Jenis Hewan",
@@ -130,54 +170,49 @@ with st.form("add_entry_form", clear_on_submit=True):
     add_entry = st.form_submit_button(f"Tambah {animal_type}")
     if add_entry:
         # Add new entry using the current form values
-        st.session_state.animal_entries.append({
-            'animal_type': animal_type,
-            'supplier': supplier,
-            'variant': variant,
-            'quantity': quantity
-        })
+        st.session_state.animal_entries.append(InboundEntry(animal_type, supplier, variant, quantity))
 
-# Display current entries with better formatting
-if st.session_state.animal_entries:
-    st.subheader("Data Hewan yang Akan Dicatat")
+def delete_entry(entry_idx):
+    """Button callback: drop one pending entry before the rerun renders"""
+    st.session_state.animal_entries.pop(entry_idx)
+
+def render_entry_group(label, entries, key_prefix):
+    """Render one animal group of pending entries, each with its delete button"""
+    st.markdown(f"##### {label}")
+    for entry_idx, entry in entries:
+        with st.container():
+            col1, col2, col3, col4 = st.columns([2,2,1,1])
+            col1.write(f"**Vendor:** {entry.supplier}")
+            col2.write(f"**Kategori:** {entry.variant}")
+            col3.write(f"**Jumlah:** {entry.quantity}")
+            
+            # Delete entry form
+            with col4:
+                delete_key = f"delete_{key_prefix}_{entry_idx}"
+                st.button("❌", key=delete_key, help="Hapus entry ini", on_click=delete_entry, args=(entry_idx,))
+
+# A delete click reruns only the pending entries, not the whole page
+@st.fragment
+def render_pending_entries():
+    """Display current entries with better formatting"""
+    entries = st.session_state.animal_entries
+    if not entries:
+        return
     
-    # Group entries by animal type
-    domba_entries = [e for e in st.session_state.animal_entries if e['animal_type'] == "Domba/Kambing"]
-    sapi_entries = [e for e in st.session_state.animal_entries if e['animal_type'] == "Sapi"]
+    st.subheader("Data Hewan yang Akan Dicatat")
     
-    # Display Domba entries
-    if domba_entries:
-        st.markdown("##### Domba/Kambing")
-        for idx, entry in enumerate(domba_entries):
-            with st.container():
-                col1, col2, col3, col4 = st.columns([2,2,1,1])
-                col1.write(f"**Vendor:** {entry['supplier']}")
-                col2.write(f"**Kategori:** {entry['variant']}")
-                col3.write(f"**Jumlah:** {entry['quantity']}")
-                
-                # Delete entry form
-                with col4:
-                    delete_key = f"delete_domba_{idx}"
-                    if st.button("❌", key=delete_key, help="Hapus entry ini"):
-                        st.session_state.animal_entries.remove(entry)
-                        st.rerun()
+    # Group entries by animal type in one pass, keeping each entry's position for deletion
+    entry_groups = {"Domba/Kambing": [], "Sapi": []}
+    for i, e in enumerate(entries):
+        if e.animal_type in entry_groups:
+            entry_groups[e.animal_type].append((i, e))
     
-    # Display Sapi entries
-    if sapi_entries:
-        st.markdown("##### Sapi")
-        for idx, entry in enumerate(sapi_entries):
-            with st.container():
-                col1, col2, col3, col4 = st.columns([2,2,1,1])
-                col1.write(f"**Vendor:** {entry['supplier']}")
-                col2.write(f"**Kategori:** {entry['variant']}")
-                col3.write(f"**Jumlah:** {entry['quantity']}")
-                
-                # Delete entry form
-                with col4:
-                    delete_key = f"delete_sapi_{idx}"
-                    if st.button("❌", key=delete_key, help="Hapus entry ini"):
-                        st.session_state.animal_entries.remove(entry)
-                        st.rerun()
+    # Display Domba entries, then Sapi entries
+    for label, key_prefix in (("Domba/Kambing", "domba"), ("Sapi", "sapi")):
+        if entry_groups[label]:
+            render_entry_group(label, entry_groups[label], key_prefix)
+
+render_pending_entries()
 
 # Main form for final submission
 with st.form("main_form"):
@@ -191,9 +226,9 @@ with st.form("main_form"):
         
         hari_masuk_label = st.selectbox(
             form_labels["fields"]["hari_masuk"],
-            list(HARI_OPTIONS.keys()),
+            HARI_LABELS,
             key="hari_masuk_label",
-            help=f"Hari H adalah {HARI_H.strftime('%d %B %Y')}"
+            help=f"Hari H adalah {HARI_H_TEXT}"
         )
         tanggal_masuk = HARI_OPTIONS[hari_masuk_label]
 
@@ -209,7 +244,8 @@ with st.form("main_form"):
     submitted = st.form_submit_button("Submit")
     
     if submitted:
-        if not st.session_state.animal_entries:
+        entries = st.session_state.animal_entries
+        if not entries:
             st.error(config.get_message("validation"))
             st.stop()
             
@@ -219,7 +255,7 @@ with st.form("main_form"):
                 st.write(f"Debug: Environment = {env_helper.current_env}")
                 st.write(f"Debug: SPREADSHEET_ID = {SPREADSHEET_ID}")
                 st.write(f"Debug: INBOUND_RANGE = {INBOUND_RANGE}")
-                st.write(f"Debug: Number of animal entries = {len(st.session_state.animal_entries)}")
+                st.write(f"Debug: Number of animal entries = {len(entries)}")
             
             # Upload receipt if provided
             receipt_url = None
@@ -233,8 +269,7 @@ with st.form("main_form"):
                     new_filename = f"{nomor_nota.strip()}.{file_extension}"
                 else:
                     # Fallback to timestamp if no receipt number provided
-                    wib_timezone = pytz.timezone('Asia/Jakarta')
-                    file_timestamp = datetime.now(wib_timezone).strftime('%Y%m%d_%H%M%S')
+                    file_timestamp = datetime.now(WIB).strftime('%Y%m%d_%H%M%S')
                     new_filename = f"nota_masuk_{file_timestamp}.{file_extension}"
                 
                 receipt_url = helper.upload_file(
@@ -247,33 +282,42 @@ with st.form("main_form"):
             
             # Create records for each animal entry
             # Use West Indonesia Time (UTC+7)
-            wib_timezone = pytz.timezone('Asia/Jakarta')
-            timestamp = datetime.now(wib_timezone).strftime("%Y-%m-%d %H:%M:%S")  # e.g., "03 June 2025 10:00:30"
+            timestamp = datetime.now(WIB).strftime("%Y-%m-%d %H:%M:%S")  # e.g., "03 June 2025 10:00:30"
             
-            for idx, entry in enumerate(st.session_state.animal_entries):
-                record = [
+            # Values shared by every record are formatted once
+            receipt_value = receipt_url or ""
+            tanggal_masuk_value = tanggal_masuk.strftime("%Y-%m-%d")
+            catatan_value = catatan or ""
+            
+            records = [
+                [
                     timestamp,                    # Timestamp
                     nomor_nota,                   # Nomor Nota
-                    entry['animal_type'],         # Jenis Hewan
-                    entry['supplier'],            # Vendor
-                    entry['variant'],             # Kategori
-                    entry['quantity'],            # Jumlah
+                    entry.animal_type,            # Jenis Hewan
+                    entry.supplier,               # Vendor
+                    entry.variant,                # Kategori
+                    entry.quantity,               # Jumlah
                     sohibul_qurban,              # Nama Sohibul Qurban
                     nama_pengirim,               # Nama Pengirim
                     nama_penerima,               # Nama Penerima
-                    receipt_url or "",           # Foto Nota
-                    tanggal_masuk.strftime("%Y-%m-%d"),  # Tanggal Masuk
-                    catatan or ""                # Catatan
+                    receipt_value,               # Foto Nota
+                    tanggal_masuk_value,         # Tanggal Masuk
+                    catatan_value                # Catatan
                 ]
-                
-                if debug_mode:
-                    st.write(f"Debug: Attempting to append record {idx + 1}: {record[:3]}...")
-                
-                # Append each record to the sheet
-                result = helper.append_record(SPREADSHEET_ID, INBOUND_RANGE, record)
-                
-                if debug_mode:
-                    st.write(f"Debug: Append result for record {idx + 1}: {result}")
+                for entry in entries
+            ]
+            
+            if debug_mode:
+                st.write(f"Debug: Attempting to append {len(records)} records: {records[0][:3]}...")
+            
+            # Append all records to the sheet in one request
+            result = helper.append_records(SPREADSHEET_ID, INBOUND_RANGE, records)
+            
+            if debug_mode:
+                st.write(f"Debug: Append result: {result}")
+            
+            # Drop cached sheet data so the dashboard shows the new records
+            st.cache_data.clear()
             
             # Clear the form
             st.session_state.animal_entries = []
@@ -283,8 +327,8 @@ with st.form("main_form"):
             if env_helper.is_development():
                 success_message += " (DEV)"
                 
-            st.toast(success_message, icon='✅')
-            time.sleep(1)  # Give time for the user to see the message
+            # The next run shows the toast, so this one doesn't block waiting for the user to see it
+            st.session_state.flash_message = success_message
             st.rerun()
             
         except Exception as e:
@@ -1,11 +1,14 @@
 import streamlit as st
 from datetime import datetime, timedelta
 import os
-from sheets_helper import GoogleHelper
+from sheets_helper import get_google_helper
 from config_helper import ConfigHelper
 from environment_helper import get_environment_helper
-import time
-import pytz
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+# West Indonesia Time (UTC+7)
+WIB = ZoneInfo("Asia/Jakarta")
 
 # Initialize environment helper (cached)
 env_helper = get_environment_helper()
@@ -34,10 +37,11 @@ env_helper.show_environment_info(show_in_sidebar=True)
 def init_config():
     return ConfigHelper()
 
-# Initialize Google helper
-@st.cache_resource
-def init_helper():
-    return GoogleHelper(GOOGLE_CREDENTIALS_FILE)
+# One pending row of the form, kept as a compact tuple in session state
+class OutboundEntry(NamedTuple):
+    animal_type: str
+    tipe_hewan: str
+    quantity: int
 
 if not SPREADSHEET_ID or not DRIVE_FOLDER_ID:
     st.error("Missing required configuration. Please check your .streamlit/secrets.toml file.")
@@ -58,22 +62,56 @@ SHEEP_CATEGORIES = config.get_sheep_categories()
 COW_CATEGORIES = config.get_cow_categories()
 HARI_OPTIONS = config.get_hari_options("outbound")
 HARI_H = config.get_hari_h_date("outbound")
+# Hari selectbox options and help text never change while the app runs
+HARI_LABELS = tuple(HARI_OPTIONS)
+HARI_H_TEXT = HARI_H.strftime('%d %B %Y')
 
 # Get form labels
 form_labels = config.get_form_labels("outbound")
 
+# Resolve labels once, with defaults for anything missing from ui_labels.json
+FIELD_LABELS = {
+    "hewan": "Hewan",
+    "tipe_hewan_domba": "Tipe Hewan (Domba/Kambing)",
+    "tipe_hewan_sapi": "Tipe Hewan (Sapi)",
+    "jumlah_hewan": "Jumlah Hewan",
+    "nomor_mobil": "Nomor Mobil (Untuk Kirim Hidup)",
+    "hari_keluar": "Hari Keluar",
+    "jenis_keluar": "Jenis Keluar",
+    "surat_jalan": "Surat Jalan (Untuk Kirim Hidup)",
+    "additional_notes": "Additional Notes",
+    **form_labels["fields"],
+}
+SECTION_LABELS = {
+    "domba": "Data Domba/Kambing",
+    "sapi": "Data Sapi",
+    **form_labels.get("sections", {}),
+}
+PLACEHOLDERS = {
+    "nomor_mobil": "Masukkan nomor kendaraan untuk pengiriman hidup",
+    "jenis_keluar_other": "Sebutkan jenis keluar lainnya",
+    "surat_jalan": "Masukkan nomor/detail surat jalan",
+    "additional_notes": "Tambahkan catatan tambahan jika diperlukan",
+    **form_labels.get("placeholders", {}),
+}
+JENIS_KELUAR_OPTIONS = config.get_form_options("outbound", "jenis_keluar")
+
 st.header(form_labels["title"])
 
 # Initialize helper
-helper = init_helper()
+helper = get_google_helper(GOOGLE_CREDENTIALS_FILE)
 
 # Initialize session state for animal entries if not exists
 if 'animal_entries' not in st.session_state:
     st.session_state.animal_entries = []
 
+# Show the success message left by the previous submit
+if 'flash_message' in st.session_state:
+    st.toast(st.session_state.pop('flash_message'), icon='✅')
+
 # Animal type selection outside the form
 animal_type = st.selectbox(
-    form_labels["fields"].get("hewan", "Hewan"),  # Use .get() with fallback
+    FIELD_LABELS["hewan"],
     ANIMAL_TYPES,
     key='animal_type'
 )
@@ -87,17 +125,17 @@ with st.form("add_entry_form", clear_on_submit=True):
     
     with col1:
         if animal_type == "Domba/Kambing":
-            st.markdown(f"##### {form_labels.get('sections', {}).get('domba', 'Data Domba/Kambing')}")
+            st.markdown(f"##### {SECTION_LABELS['domba']}")
             tipe_hewan = st.selectbox(
-                form_labels["fields"].get("tipe_hewan_domba", "Tipe Hewan (Domba/Kambing)"), 
+                FIELD_LABELS["tipe_hewan_domba"], 
                 SHEEP_CATEGORIES, 
                 key="domba_tipe",
                 help="Pilih tipe domba/kambing"
             )
         else:  # Sapi
-            st.markdown(f"##### {form_labels.get('sections', {}).get('sapi', 'Data Sapi')}")
+            st.markdown(f"##### {SECTION_LABELS['sapi']}")
             tipe_hewan = st.selectbox(
-                form_labels["fields"].get("tipe_hewan_sapi", "Tipe Hewan (Sapi)"), 
+                FIELD_LABELS["tipe_hewan_sapi"], 
                 COW_CATEGORIES, 
                 key="sapi_tipe",
                 help="Pilih tipe sapi"
@@ -106,7 +144,7 @@ with st.form("add_entry_form", clear_on_submit=True):
     with col2:
         st.markdown("##### Jumlah")
         quantity = st.number_input(
-            form_labels["fields"].get("jumlah_hewan", "Jumlah Hewan"), 
+            FIELD_LABELS["jumlah_hewan"], 
             value=1, 
             key="quantity",
             help=f"Masukkan jumlah {animal_type.lower()} yang keluar (gunakan nilai negatif untuk edit/koreksi)"
@@ -116,51 +154,59 @@ with st.form("add_entry_form", clear_on_submit=True):
     add_entry = st.form_submit_button(f"Tambah {animal_type}")
     if add_entry:
         # Add new entry using the current form values
-        st.session_state.animal_entries.append({
-            'animal_type': animal_type,
-            'tipe_hewan': tipe_hewan,
-            'quantity': quantity
-        })
+        st.session_state.animal_entries.append(OutboundEntry(animal_type, tipe_hewan, quantity))
+
+def delete_entry(entry_idx):
+    """Button callback: drop one pending entry before the rerun renders"""
+    st.session_state.animal_entries.pop(entry_idx)
 
-# Display current entries with better formatting
-if st.session_state.animal_entries:
+# A delete click reruns only the pending entries, not the whole page
+@st.fragment
+def render_pending_entries():
+    """Display current entries with better formatting"""
+    entries = st.session_state.animal_entries
+    if not entries:
+        return
+    
     st.subheader("Data Hewan yang Akan Dicatat")
     
-    # Group entries by animal type
-    domba_entries = [e for e in st.session_state.animal_entries if e['animal_type'] == "Domba/Kambing"]
-    sapi_entries = [e for e in st.session_state.animal_entries if e['animal_type'] == "Sapi"]
+    # Group entries by animal type in one pass, keeping each entry's position for deletion
+    entry_groups = {"Domba/Kambing": [], "Sapi": []}
+    for i, e in enumerate(entries):
+        if e.animal_type in entry_groups:
+            entry_groups[e.animal_type].append((i, e))
+    domba_entries = entry_groups["Domba/Kambing"]
+    sapi_entries = entry_groups["Sapi"]
     
     # Display Domba entries
     if domba_entries:
         st.markdown("##### Domba/Kambing")
-        for idx, entry in enumerate(domba_entries):
+        for entry_idx, entry in domba_entries:
             with st.container():
                 col1, col2, col3, col4 = st.columns([2,2,1,1])
-                col1.write(f"**Tipe:** {entry['tipe_hewan']}")
-                col2.write(f"**Jumlah:** {entry['quantity']}")
+                col1.write(f"**Tipe:** {entry.tipe_hewan}")
+                col2.write(f"**Jumlah:** {entry.quantity}")
                 
                 # Delete entry form
                 with col4:
-                    delete_key = f"delete_domba_{idx}"
-                    if st.button("❌", key=delete_key, help="Hapus entry ini"):
-                        st.session_state.animal_entries.remove(entry)
-                        st.rerun()
+                    delete_key = f"delete_domba_{entry_idx}"
+                    st.button("❌", key=delete_key, help="Hapus entry ini", on_click=delete_entry, args=(entry_idx,))
     
     # Display Sapi entries
     if sapi_entries:
         st.markdown("##### Sapi")
-        for idx, entry in enumerate(sapi_entries):
+        for entry_idx, entry in sapi_entries:
             with st.container():
                 col1, col2, col3, col4 = st.columns([2,2,1,1])
-                col1.write(f"**Tipe:** {entry['tipe_hewan']}")
-                col2.write(f"**Jumlah:** {entry['quantity']}")
+                col1.write(f"**Tipe:** {entry.tipe_hewan}")
+                col2.write(f"**Jumlah:** {entry.quantity}")
                 
                 # Delete entry form
                 with col4:
-                    delete_key = f"delete_sapi_{idx}"
-                    if st.button("❌", key=delete_key, help="Hapus entry ini"):
-                        st.session_state.animal_entries.remove(entry)
-                        st.rerun()
+                    delete_key = f"delete_sapi_{entry_idx}"
+                    st.button("❌", key=delete_key, help="Hapus entry ini", on_click=delete_entry, args=(entry_idx,))
+
+render_pending_entries()
 
 # Main form for final submission
 with st.form("main_form"):
@@ -169,22 +215,22 @@ with st.form("main_form"):
     
     with col1:
         nomor_mobil = st.text_input(
-            form_labels["fields"].get("nomor_mobil", "Nomor Mobil (Untuk Kirim Hidup)"), 
+            FIELD_LABELS["nomor_mobil"], 
             key="nomor_mobil",
-            placeholder=form_labels.get("placeholders", {}).get("nomor_mobil", "Masukkan nomor kendaraan untuk pengiriman hidup")
+            placeholder=PLACEHOLDERS["nomor_mobil"]
         )
         
         hari_keluar_label = st.selectbox(
-            form_labels["fields"].get("hari_keluar", "Hari Keluar"),
-            list(HARI_OPTIONS.keys()),
+            FIELD_LABELS["hari_keluar"],
+            HARI_LABELS,
             key="hari_keluar_label",
-            help=f"Hari H adalah {HARI_H.strftime('%d %B %Y')}"
+            help=f"Hari H adalah {HARI_H_TEXT}"
         )
         tanggal_keluar = HARI_OPTIONS[hari_keluar_label]
         
         jenis_keluar = st.selectbox(
-            form_labels["fields"].get("jenis_keluar", "Jenis Keluar"),
-            config.get_form_options("outbound", "jenis_keluar"),
+            FIELD_LABELS["jenis_keluar"],
+            JENIS_KELUAR_OPTIONS,
             key="jenis_keluar"
         )
         
@@ -194,26 +240,27 @@ with st.form("main_form"):
             jenis_keluar_other = st.text_input(
                 "Sebutkan jenis keluar:",
                 key="jenis_keluar_other",
-                placeholder=form_labels.get("placeholders", {}).get("jenis_keluar_other", "Sebutkan jenis keluar lainnya")
+                placeholder=PLACEHOLDERS["jenis_keluar_other"]
             )
 
     with col2:
         surat_jalan = st.text_input(
-            form_labels["fields"].get("surat_jalan", "Surat Jalan (Untuk Kirim Hidup)"),
+            FIELD_LABELS["surat_jalan"],
             key="surat_jalan",
-            placeholder=form_labels.get("placeholders", {}).get("surat_jalan", "Masukkan nomor/detail surat jalan")
+            placeholder=PLACEHOLDERS["surat_jalan"]
         )
         
         additional_notes = st.text_area(
-            form_labels["fields"].get("additional_notes", "Additional Notes"),
+            FIELD_LABELS["additional_notes"],
             key="additional_notes",
-            placeholder=form_labels.get("placeholders", {}).get("additional_notes", "Tambahkan catatan tambahan jika diperlukan")
+            placeholder=PLACEHOLDERS["additional_notes"]
         )
 
     submitted = st.form_submit_button("Submit")
     
     if submitted:
-        if not st.session_state.animal_entries:
+        entries = st.session_state.animal_entries
+        if not entries:
             st.error(config.get_message("validation"))
             st.stop()
             
@@ -223,39 +270,49 @@ with st.form("main_form"):
                 st.write(f"Debug: Environment = {env_helper.current_env}")
                 st.write(f"Debug: SPREADSHEET_ID = {SPREADSHEET_ID}")
                 st.write(f"Debug: OUTBOUND_RANGE = {OUTBOUND_RANGE}")
-                st.write(f"Debug: Number of animal entries = {len(st.session_state.animal_entries)}")
+                st.write(f"Debug: Number of animal entries = {len(entries)}")
             
             # Create records for each animal entry
             # Use West Indonesia Time (UTC+7)
-            wib_timezone = pytz.timezone('Asia/Jakarta')
-            timestamp = datetime.now(wib_timezone).strftime("%Y-%m-%d %H:%M:%S")  # e.g., "03 June 2025 10:00:30"
+            timestamp = datetime.now(WIB).strftime("%Y-%m-%d %H:%M:%S")  # e.g., "03 June 2025 10:00:30"
             
-            for entry in st.session_state.animal_entries:
-                # Determine final jenis_keluar value
-                final_jenis_keluar = jenis_keluar
-                if jenis_keluar == "Lainnya" and jenis_keluar_other:
-                    final_jenis_keluar = jenis_keluar_other
-                
-                record = [
+            # Determine final jenis_keluar value
+            final_jenis_keluar = jenis_keluar
+            if jenis_keluar == "Lainnya" and jenis_keluar_other:
+                final_jenis_keluar = jenis_keluar_other
+            
+            # Columns shared by every record, formatted once
+            tanggal_keluar_value = tanggal_keluar.strftime("%Y-%m-%d")
+            nomor_mobil_value = nomor_mobil or ""
+            surat_jalan_value = surat_jalan or ""
+            notes_value = additional_notes or ""
+            
+            records = [
+                [
                     timestamp,                    # Timestamp
-                    entry['animal_type'],         # Hewan
-                    entry['tipe_hewan'],          # Tipe Hewan
-                    entry['quantity'],            # Jumlah Hewan
-                    nomor_mobil or "",           # Nomor Mobil (Untuk Kirim Hidup)
-                    tanggal_keluar.strftime("%Y-%m-%d"),  # Hari Keluar
-                    final_jenis_keluar,          # Jenis Keluar
-                    surat_jalan or "",           # Surat Jalan (Untuk Kirim Hidup)
-                    additional_notes or ""        # Additional Notes
+                    entry.animal_type,            # Hewan
+                    entry.tipe_hewan,             # Tipe Hewan
+                    entry.quantity,               # Jumlah Hewan
+                    nomor_mobil_value,            # Nomor Mobil (Untuk Kirim Hidup)
+                    tanggal_keluar_value,         # Hari Keluar
+                    final_jenis_keluar,           # Jenis Keluar
+                    surat_jalan_value,            # Surat Jalan (Untuk Kirim Hidup)
+                    notes_value                   # Additional Notes
                 ]
-                
-                if debug_mode:
-                    st.write(f"Debug: Attempting to append record: {record[:3]}...")
-                
-                # Append each record to the sheet
-                result = helper.append_record(SPREADSHEET_ID, OUTBOUND_RANGE, record)
-                
-                if debug_mode:
-                    st.write(f"Debug: Append result: {result}")
+                for entry in entries
+            ]
+            
+            if debug_mode:
+                st.write(f"Debug: Attempting to append {len(records)} records: {records[0][:3]}...")
+            
+            # Append all records to the sheet in one request
+            result = helper.append_records(SPREADSHEET_ID, OUTBOUND_RANGE, records)
+            
+            if debug_mode:
+                st.write(f"Debug: Append result: {result}")
+            
+            # Drop cached sheet data so the dashboard shows the new records
+            st.cache_data.clear()
             
             # Clear the form
             st.session_state.animal_entries = []
@@ -265,8 +322,8 @@ with st.form("main_form"):
             if env_helper.is_development():
                 success_message += " (DEV)"
                 
-            st.toast(success_message, icon='✅')
-            time.sleep(1)  # Give time for the user to see the message
+            # The next run shows the toast, so this one doesn't block waiting for the user to see it
+            st.session_state.flash_message = success_message
             st.rerun()
             
         except Exception as e:
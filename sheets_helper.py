@@ -1,9 +1,15 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
-import pandas as pd
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 from datetime import datetime
+import httplib2
 import io
+import os
+import random
+import socket
+import ssl
+import time
 import streamlit as st
 
 # Try to import magic, fallback if not available
@@ -19,6 +25,76 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive'
 ]
 
+# MIME types for the receipt extensions we expect
+_EXT_MIME = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/msword'
+}
+
+# Header bytes handed to libmagic when sniffing an upload's type
+MIME_SNIFF_BYTES = 2048
+# Uploads above this size use a resumable session
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+# Resumable uploads are sent in chunks of this size (a multiple of 256 KB, as Drive requires)
+RESUMABLE_CHUNK_SIZE = 1024 * 1024
+
+# Rate limits and transient server errors; other HTTP errors won't succeed on a retry
+RETRYABLE_STATUSES = (429, 500, 503)
+# Failures of the connection itself, as opposed to bugs in our own code
+TRANSPORT_ERRORS = (OSError, socket.timeout, httplib2.HttpLib2Error, ssl.SSLError)
+# Transport failures raised while connecting, before any of the request went out
+CONNECT_ERRORS = (ConnectionRefusedError, socket.gaierror, httplib2.ServerNotFoundError)
+
+def _is_retryable(error, idempotent=True):
+    """Whether a failed request is worth retrying"""
+    # A non-idempotent request (an append) is only retried when the server can't
+    # have applied it: a 429, or a failure before the request was sent
+    if isinstance(error, HttpError):
+        if idempotent:
+            return error.resp.status in RETRYABLE_STATUSES
+        return error.resp.status == 429
+    return isinstance(error, TRANSPORT_ERRORS if idempotent else CONNECT_ERRORS)
+
+def _backoff_delay(attempt):
+    """Exponential backoff with jitter, so concurrent sessions don't retry in lockstep"""
+    return (2 ** attempt) * 0.5 + random.random() * 0.5
+
+def _row_window_ranges(range_name, row_start, row_end=None):
+    """Split a range like 'Inbound!A1:K' into its header row and a window of data rows"""
+    sheet_name, _, cells = range_name.rpartition('!')
+    if not sheet_name:
+        # Bare sheet name, so take whole rows (ZZZ is the last column Sheets allows)
+        sheet_name, cells = range_name, 'A:ZZZ'
+    
+    start_col, _, end_col = cells.partition(':')
+    start_col = start_col.rstrip('0123456789')
+    end_col = (end_col or start_col).rstrip('0123456789')
+    return (f"{sheet_name}!{start_col}1:{end_col}1",
+            f"{sheet_name}!{start_col}{row_start}:{end_col}{row_end or ''}")
+
+class SheetReadError(Exception):
+    """A Sheets read that still failed after its retries"""
+    def __init__(self, message, connection=False):
+        super().__init__(message)
+        # SSL/network failure rather than an API error
+        self.connection = connection
+
+def show_read_error(error):
+    """Explain a failed SheetReadError to the user"""
+    if error.connection:
+        st.error("🚫 **Masalah Koneksi SSL/Jaringan**")
+        st.error("Kemungkinan penyebab:")
+        st.error("- Koneksi internet tidak stabil")
+        st.error("- Firewall atau proxy memblokir akses")
+        st.error("- Masalah sementara dengan Google API")
+        st.error("**Solusi:** Coba refresh halaman atau cek koneksi internet")
+    else:
+        st.error(f"❌ Error reading sheet data: {error}")
+
 class GoogleHelper:
     def __init__(self, credentials_path):
         if credentials_path == "embedded":
@@ -31,203 +107,272 @@ class GoogleHelper:
             self.credentials = service_account.Credentials.from_service_account_file(
                 credentials_path, scopes=SCOPES)
         
-        self.sheets = build('sheets', 'v4', credentials=self.credentials).spreadsheets()
-        self.drive = build('drive', 'v3', credentials=self.credentials)
+        # Both discovery documents ship with the client library, so building fetches nothing
+        self.sheets = build('sheets', 'v4', credentials=self.credentials, cache_discovery=False,
+                            static_discovery=True).spreadsheets()
+        self.drive = build('drive', 'v3', credentials=self.credentials, cache_discovery=False,
+                           static_discovery=True)
+
+    def append_record(self, spreadsheet_id, range_name, values, raw=False):
+        """Append one row after the existing data"""
+        return self.append_records(spreadsheet_id, range_name, [values], raw=raw)
 
-    def append_record(self, spreadsheet_id, range_name, values):
-        max_retries = 3
-        retry_delay = 2
+    def append_records(self, spreadsheet_id, range_name, rows, raw=False):
+        """Append several rows after the existing data in one values.append request"""
+        # RAW stores already-typed values as sent, skipping Sheets' per-cell parsing
+        value_input_option = 'RAW' if raw else 'USER_ENTERED'
+        
+        max_retries = 5
+        
+        # Parse the range_name to extract sheet name
+        sheet_name = range_name.split('!')[0]
         
         for attempt in range(max_retries):
             try:
-                # Parse the range_name to extract sheet name
-                if '!' in range_name:
-                    sheet_name = range_name.split('!')[0]
-                else:
-                    sheet_name = range_name
-                
-                # First, get all existing data to find the next empty row
-                try:
-                    read_range = f"{sheet_name}!A:A"
-                    result = self.sheets.values().get(
-                        spreadsheetId=spreadsheet_id,
-                        range=read_range
-                    ).execute()
-                    existing_values = result.get('values', [])
-                    next_row = len(existing_values) + 1
-                except:
-                    # If sheet doesn't exist or has no data, start at row 2 (after header)
-                    next_row = 2
-                    
-                body = {
-                    'values': [values]
-                }
-                
-                # Calculate the end column based on number of values
-                end_column_index = len(values) - 1
-                end_column = chr(65 + end_column_index)  # Convert to letter (A=0, B=1, etc.)
-                
-                # Create the correct write range
-                write_range = f"{sheet_name}!A{next_row}:{end_column}{next_row}"
-                
-                result = self.sheets.values().update(
+                # Sheets finds the end of the table itself, so no read is needed first
+                return self.sheets.values().append(
                     spreadsheetId=spreadsheet_id,
-                    range=write_range,
-                    valueInputOption='USER_ENTERED',
-                    body=body
+                    range=f"{sheet_name}!A1",
+                    valueInputOption=value_input_option,
+                    insertDataOption='INSERT_ROWS',
+                    body={'values': rows}
                 ).execute()
-                return result
                 
             except Exception as e:
                 error_msg = str(e)
                 
-                # Check for SSL/network errors
-                if "SSL" in error_msg.upper() or "WRONG_VERSION_NUMBER" in error_msg:
-                    if attempt < max_retries - 1:
-                        st.warning(f"⚠️ Koneksi terputus saat menyimpan (percobaan {attempt + 1}/{max_retries}). Mencoba lagi...")
-                        import time
-                        time.sleep(retry_delay)
-                        continue
+                # INSERT_ROWS isn't idempotent: a 5xx or a dropped connection may
+                # already have written the rows, so only retry when it can't have
+                if attempt < max_retries - 1 and _is_retryable(e, idempotent=False):
+                    if isinstance(e, HttpError):
+                        st.warning(f"⚠️ Error menyimpan data (percobaan {attempt + 1}/{max_retries}): {error_msg}")
                     else:
-                        st.error("🚫 **Gagal menyimpan data - Masalah koneksi**")
-                        raise Exception(f"SSL connection failed after {max_retries} attempts: {error_msg}")
-                
-                # For other errors, retry or raise
-                if attempt < max_retries - 1:
-                    st.warning(f"⚠️ Error menyimpan data (percobaan {attempt + 1}/{max_retries}): {error_msg}")
-                    import time
-                    time.sleep(retry_delay)
+                        st.warning(f"⚠️ Koneksi terputus saat menyimpan (percobaan {attempt + 1}/{max_retries}). Mencoba lagi...")
+                    time.sleep(_backoff_delay(attempt))
                     continue
-                else:
-                    raise Exception(f"Failed to append record after {max_retries} attempts: {error_msg}")
+                
+                if isinstance(e, TRANSPORT_ERRORS):
+                    st.error("🚫 **Gagal menyimpan data - Masalah koneksi**")
+                raise Exception(f"Failed to append records after {attempt + 1} attempts: {error_msg}")
+
+    def _to_df(self, values):
+        """Build a DataFrame from raw sheet values, first row as header"""
+        # pandas is heavy to import and the form pages only write, so only pay for it on a read
+        import pandas as pd
+        
+        if not values:
+            return pd.DataFrame()
+        
+        # The constructor pads ragged rows with None in one pass
+        df = pd.DataFrame(values[1:], dtype=object)
+        max_cols = max(len(values[0]), df.shape[1])
+        
+        if max_cols == 0:
+            return pd.DataFrame()
+        
+        # Simple padding without complex filtering
+        headers = values[0] + [''] * (max_cols - len(values[0]))
+        
+        # Widen to the header row and blank out the padding
+        df = df.reindex(columns=range(max_cols), fill_value='').fillna('')
+        df.columns = headers
+        
+        return df
 
-    def get_records(self, spreadsheet_id, range_name):
-        max_retries = 3
-        retry_delay = 2
+    def get_records(self, spreadsheet_id, range_name, row_start=None, row_end=None,
+                    value_render_option='FORMATTED_VALUE', tail=None, headers=None):
+        """Read one range; row_start/row_end fetch only that window of data rows under the header"""
+        if tail is not None:
+            if tail < 1:
+                # A window of zero or fewer rows would build a reversed range, which Sheets still reads
+                raise ValueError(f"tail must be at least 1, got {tail}")
+            # Only the last `tail` data rows, found from the length of the first column
+            # An empty row 2 stands in for a header-only sheet, keeping the window in order
+            row_end = max(self._row_count(spreadsheet_id, range_name), 2)
+            row_start = max(2, row_end - tail + 1)
+        
+        if headers is not None:
+            # The caller already knows the header row (e.g. ConfigHelper.get_sheet_columns),
+            # so only data rows are fetched
+            _, rows_range = _row_window_ranges(range_name, row_start or 2, row_end)
+            rows, = self._batch_get_values(spreadsheet_id, [rows_range], value_render_option)
+            return self._to_df([list(headers)] + rows)
+        
+        if row_start is None and row_end is None:
+            return self.get_records_batch(spreadsheet_id, [range_name], value_render_option)[0]
+        
+        # Header and row window come back together in one batchGet
+        header_range, rows_range = _row_window_ranges(range_name, row_start or 2, row_end)
+        header, rows = self._batch_get_values(spreadsheet_id, [header_range, rows_range], value_render_option)
+        return self._to_df((header or [[]])[:1] + rows)
+
+    def _row_count(self, spreadsheet_id, range_name):
+        """Number of rows in use, header included, read from the range's first column only"""
+        # The grid's rowCount includes the blank rows under the data, so it can't be used here
+        header_range, _ = _row_window_ranges(range_name, 1)
+        sheet_name, _, cells = header_range.rpartition('!')
+        first_col = cells.split(':')[0].rstrip('0123456789')
+        values, = self._batch_get_values(spreadsheet_id, [f"{sheet_name}!{first_col}:{first_col}"], 'FORMATTED_VALUE')
+        return len(values)
+
+    def get_records_batch(self, spreadsheet_id, range_names, value_render_option='FORMATTED_VALUE',
+                          raise_errors=False):
+        """Read several ranges in one batchGet request, one DataFrame per range"""
+        return [self._to_df(values) for values in
+                self._batch_get_values(spreadsheet_id, range_names, value_render_option, raise_errors)]
+
+    def _batch_get_values(self, spreadsheet_id, range_names, value_render_option, raise_errors=False):
+        """Fetch raw values for several ranges, empty for all of them if the read fails"""
+        # With raise_errors a failure is raised as SheetReadError instead of shown,
+        # so cached callers don't keep the empty result
+        max_retries = 5
         
         for attempt in range(max_retries):
             try:
-                result = self.sheets.values().get(
+                result = self.sheets.values().batchGet(
                     spreadsheetId=spreadsheet_id,
-                    range=range_name
+                    ranges=list(range_names),
+                    valueRenderOption=value_render_option
                 ).execute()
-                values = result.get('values', [])
-                
-                
-                if not values:
-                    return pd.DataFrame()
-                
-                # Simplified processing - just pad rows to max length
-                max_cols = max(len(row) for row in values) if values else 0
-                
-                if max_cols == 0:
-                    return pd.DataFrame()
+                # Value ranges come back in the requested order
+                value_ranges = result.get('valueRanges', [])
                 
-                # Simple padding without complex filtering
-                headers = values[0] + [''] * (max_cols - len(values[0]))
-                
-                # Pad all data rows to match max_cols
-                data_rows = []
-                for row in values[1:]:
-                    padded_row = row + [''] * (max_cols - len(row))
-                    data_rows.append(padded_row)
-                
-                # Create DataFrame directly
-                if data_rows:
-                    df = pd.DataFrame(data_rows, columns=headers)
-                else:
-                    df = pd.DataFrame(columns=headers)
-                    
-                return df
+                return [value_range.get('values', []) for value_range in value_ranges]
                 
             except Exception as e:
                 error_msg = str(e)
                 
                 # Check for SSL/network errors
-                if "SSL" in error_msg.upper() or "WRONG_VERSION_NUMBER" in error_msg:
+                if isinstance(e, TRANSPORT_ERRORS) and ("SSL" in error_msg.upper() or "WRONG_VERSION_NUMBER" in error_msg):
                     if attempt < max_retries - 1:
-                        st.warning(f"⚠️ Koneksi terputus (percobaan {attempt + 1}/{max_retries}). Mencoba lagi dalam {retry_delay} detik...")
-                        import time
-                        time.sleep(retry_delay)
+                        st.warning(f"⚠️ Koneksi terputus (percobaan {attempt + 1}/{max_retries}). Mencoba lagi...")
+                        time.sleep(_backoff_delay(attempt))
                         continue
                     else:
-                        st.error("🚫 **Masalah Koneksi SSL/Jaringan**")
-                        st.error("Kemungkinan penyebab:")
-                        st.error("- Koneksi internet tidak stabil")
-                        st.error("- Firewall atau proxy memblokir akses")
-                        st.error("- Masalah sementara dengan Google API")
-                        st.error("**Solusi:** Coba refresh halaman atau cek koneksi internet")
-                        return pd.DataFrame()
+                        error = SheetReadError(error_msg, connection=True)
+                        if raise_errors:
+                            raise error from e
+                        show_read_error(error)
+                        return [[] for _ in range_names]
                 
                 # For other errors, show general error message
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and _is_retryable(e):
                     st.warning(f"⚠️ Error membaca data (percobaan {attempt + 1}/{max_retries}): {error_msg}")
-                    import time
-                    time.sleep(retry_delay)
+                    time.sleep(_backoff_delay(attempt))
                     continue
                 else:
-                    st.error(f"❌ Error reading sheet data: {error_msg}")
-                    return pd.DataFrame()
+                    error = SheetReadError(error_msg)
+                    if raise_errors:
+                        raise error from e
+                    show_read_error(error)
+                    return [[] for _ in range_names]
 
     def _detect_mime_type(self, file_bytes, filename):
         """Detect mime type with fallback methods"""
+        # Known extensions need no content sniffing
+        mime_type = _EXT_MIME.get(os.path.splitext(filename)[1].lower())
+        if mime_type:
+            return mime_type
+        
         if MAGIC_AVAILABLE:
             try:
-                return magic.from_buffer(file_bytes.getvalue(), mime=True)
+                # libmagic only looks at the file header
+                file_bytes.seek(0)
+                return magic.from_buffer(file_bytes.read(MIME_SNIFF_BYTES), mime=True)
             except Exception:
                 pass
         
-        # Fallback: basic mime type detection based on file extension
-        filename_lower = filename.lower()
-        if filename_lower.endswith(('.jpg', '.jpeg')):
-            return 'image/jpeg'
-        elif filename_lower.endswith('.png'):
-            return 'image/png'
-        elif filename_lower.endswith('.pdf'):
-            return 'application/pdf'
-        elif filename_lower.endswith(('.doc', '.docx')):
-            return 'application/msword'
-        else:
-            return 'application/octet-stream'
+        return 'application/octet-stream'
 
     def upload_file(self, file_bytes, filename, folder_id):
         """Upload a file to Google Drive and return the shareable link."""
         try:
             # Detect mime type with fallback
             mime_type = self._detect_mime_type(file_bytes, filename)
-            
-            # Create file metadata
-            file_metadata = {
-                'name': filename,
-                'parents': [folder_id] if folder_id else []
-            }
-
-            # Create media
+
+            # Small receipts go up in one request; resumable uploads cost an extra round trip
+            file_size = file_bytes.seek(0, io.SEEK_END)
+
+            # Create media over the uploaded file itself
+            file_bytes.seek(0)
             media = MediaIoBaseUpload(
-                io.BytesIO(file_bytes.getvalue()),
+                file_bytes,
                 mimetype=mime_type,
-                resumable=True
+                chunksize=RESUMABLE_CHUNK_SIZE,
+                resumable=file_size > RESUMABLE_UPLOAD_THRESHOLD
             )
 
-            # Upload file
-            file = self.drive.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, webViewLink'
-            ).execute()
+            return self._create_file(media, filename, folder_id)
+
+        except Exception as e:
+            raise Exception(f"Error uploading file to Google Drive: {str(e)}")
+
+    def upload_path(self, path, filename, folder_id):
+        """Upload a file on disk to Google Drive and return the shareable link."""
+        try:
+            with open(path, 'rb') as f:
+                mime_type = self._detect_mime_type(f, filename)
 
-            return file.get('webViewLink')
+            # Read from disk chunk by chunk instead of holding the whole file in memory
+            media = MediaFileUpload(
+                path,
+                mimetype=mime_type,
+                chunksize=RESUMABLE_CHUNK_SIZE,
+                resumable=os.path.getsize(path) > RESUMABLE_UPLOAD_THRESHOLD
+            )
+            try:
+                return self._create_file(media, filename, folder_id)
+            finally:
+                media.stream().close()
 
         except Exception as e:
             raise Exception(f"Error uploading file to Google Drive: {str(e)}")
 
+    def _create_file(self, media, filename, folder_id):
+        """Create the Drive file from prepared media and return its shareable link"""
+        # Create file metadata
+        file_metadata = {
+            'name': filename,
+            'parents': [folder_id] if folder_id else []
+        }
+
+        request = self.drive.files().create(
+            body=file_metadata,
+            media_body=media,
+            fields='id, webViewLink',
+            supportsAllDrives=True
+        )
+
+        if media.resumable():
+            # Chunks are resent at their offset within one session, so the client's own
+            # retries on rate limits and 5xx can't leave a second file behind
+            return request.execute(num_retries=4).get('webViewLink')
+
+        # A multipart create isn't idempotent: after a 5xx or a dropped connection the
+        # file may already exist, so retry only when it can't have been created
+        max_retries = 5
+        for attempt in range(max_retries):
+            try:
+                return request.execute().get('webViewLink')
+            except Exception as e:
+                if attempt < max_retries - 1 and _is_retryable(e, idempotent=False):
+                    time.sleep(_backoff_delay(attempt))
+                    continue
+                raise
+
+# One helper, and so one set of credentials and clients, per credentials source for the whole process
+@st.cache_resource
+def get_google_helper(credentials_path) -> GoogleHelper:
+    """Get cached Google helper instance"""
+    return GoogleHelper(credentials_path)
+
 def format_record(timestamp, date, animal_type, size, quantity, notes, receipt_url=None):
     record = [
         timestamp,
         date,
         animal_type,
         size,
-        quantity,
+        int(quantity),  # Sent as a JSON number rather than text for Sheets to parse
         notes
     ]
     if receipt_url:
@@ -3,7 +3,7 @@ import os
 from datetime import datetime
 import pandas as pd
 from dotenv import load_dotenv
-import pytz
+from zoneinfo import ZoneInfo
 
 # Try to load dev.env first, fall back to .env if dev.env doesn't exist
 if os.path.exists('dev.env'):
@@ -22,9 +22,8 @@ def test_google_sheets(helper, spreadsheet_id):
     
     # Test data with WIB timezone
     test_range = "Test!A1:F"
-    wib_timezone = pytz.timezone('Asia/Jakarta')
     test_record = [
-        datetime.now(wib_timezone).strftime("%Y-%m-%d %H:%M:%S"),
+        datetime.now(ZoneInfo("Asia/Jakarta")).strftime("%Y-%m-%d %H:%M:%S"),
         "Goat",
         "Medium",
         "2",
@@ -40,10 +39,10 @@ def test_google_sheets(helper, spreadsheet_id):
         
         # Test reading
         print("\nTesting read operation...")
-        df = helper.get_records(spreadsheet_id, test_range)
+        df = helper.get_records(spreadsheet_id, test_range, tail=5)
         print("✓ Successfully read records")
         print("\nLast 5 records in sheet:")
-        print(df.tail())
+        print(df)
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -63,18 +62,13 @@ def test_google_drive(helper, folder_id):
     try:
         # Test file upload
         print("\nTesting file upload...")
-        with open(test_file_path, "rb") as f:
-            file_content = f.read()
-            from io import BytesIO
-            file_bytes = BytesIO(file_content)
-            
-            drive_link = helper.upload_file(
-                file_bytes,
-                "test_receipt.txt",
-                folder_id
-            )
-            print("✓ Successfully uploaded file")
-            print(f"File accessible at: {drive_link}")
+        drive_link = helper.upload_path(
+            test_file_path,
+            "test_receipt.txt",
+            folder_id
+        )
+        print("✓ Successfully uploaded file")
+        print(f"File accessible at: {drive_link}")
             
     except Exception as e:
         print(f"❌ Error: {str(e)}")